@@ -0,0 +1,79 @@
+import copy
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# In-process cache: str(user id) -> (expires_at, user)
+_local_users = {}
+
+
+def _cache_key(user_id):
+    return f'jwt-user:{user_id}'
+
+
+def get_cached_user(user_id):
+    """Return the cached user for an id, checking this process first and then the shared cache"""
+    entry = _local_users.get(str(user_id))
+    if entry is not None and entry[0] > time.monotonic():
+        return copy.copy(entry[1])
+    user = cache.get(_cache_key(user_id))
+    if user is not None:
+        _remember_locally(user_id, user)
+    return user
+
+
+def cache_user(user_id, user):
+    cache.set(_cache_key(user_id), user, settings.JWT_USER_CACHE_TTL)
+    _remember_locally(user_id, user)
+
+
+def _remember_locally(user_id, user):
+    if len(_local_users) >= settings.JWT_USER_LOCAL_CACHE_SIZE:
+        _local_users.clear()
+    _local_users[str(user_id)] = (time.monotonic() + settings.JWT_USER_LOCAL_CACHE_TTL, copy.copy(user))
+
+
+def invalidate_cached_user(user_id):
+    """
+    Forget a user now and again once the surrounding transaction commits.
+    Other processes drop their local copy when its short TTL runs out.
+    """
+    _local_users.pop(str(user_id), None)
+    cache.delete(_cache_key(user_id))
+    transaction.on_commit(lambda: cache.delete(_cache_key(user_id)))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the token's user from a short-lived
+    in-process cache backed by the shared cache, instead of querying the
+    users table on every request. Entries are invalidated by the User
+    signal handlers in core.signals.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        user = get_cached_user(user_id)
+        if user is None:
+            # Full lookup and checks; only cache users that pass them
+            user = super().get_user(validated_token)
+            cache_user(user_id, user)
+            return user
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -0,0 +1,77 @@
+import hashlib
+from django.db.models import Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from .models import Tombstone
+
+
+def make_etag(*parts):
+    """Weak ETag over the given version parts"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'W/"{digest}"'
+
+
+def not_modified(request, etag, last_modified):
+    """A 304 response if the request's validators still match, else None"""
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified else None,
+    )
+    if response is not None:
+        set_validators(response, etag, last_modified)
+    return response
+
+
+def set_validators(response, etag, last_modified):
+    response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
+
+
+class ConditionalRetrieveMixin:
+    """
+    Conditional GET for detail views of models with `updated_at`: the ETag is
+    derived from the row version and checked after get_object() (so
+    permissions still apply) but before the serializer runs.
+    """
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag = make_etag(instance._meta.label, instance.pk, instance.updated_at.isoformat())
+        response = not_modified(request, etag, instance.updated_at)
+        if response is not None:
+            return response
+        response = super().retrieve(request, *args, **kwargs)
+        return set_validators(response, etag, instance.updated_at)
+
+
+class ConditionalListMixin:
+    """
+    Conditional GET for list views of models with `updated_at`. The ETag
+    versions the tables a list is read from rather than the filtered rows:
+    the newest updated_at of the model and of each model on its path to
+    Project (membership changes touch the project), plus the newest
+    tombstone id for deletes. Each is a single lookup on an index, so the
+    check costs the same however large the collection; writes to unrelated
+    rows of those tables only cost clients a full response. Lists send no
+    Last-Modified: a delete doesn't move the newest updated_at, so
+    If-Modified-Since alone can't validate them.
+    """
+    def get_version_models(self):
+        """The list's model and the models on its `project_lookup` path"""
+        model = self.get_serializer_class().Meta.model
+        models = [model]
+        for name in filter(None, (model.objects.all().project_lookup or '').split('__')):
+            models.append(models[-1]._meta.get_field(name).related_model)
+        return models
+
+    def list(self, request, *args, **kwargs):
+        versions = [model.objects.aggregate(last=Max('updated_at'))['last'] for model in self.get_version_models()]
+        versions.append(Tombstone.objects.aggregate(last=Max('id'))['last'])
+        etag = make_etag(request.user.pk, request.get_full_path(), *versions)
+        response = not_modified(request, etag, None)
+        if response is not None:
+            return response
+        response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag, None)
@@ -0,0 +1,20 @@
+import django_filters
+from .models import Task
+
+
+class TaskFilter(django_filters.FilterSet):
+    """
+    Server-side filters for the task list. Each filter (and the common
+    combinations with status) is served by an index on Task or Milestone.
+    """
+    status = django_filters.ChoiceFilter(choices=Task.STATUS_CHOICES)
+    priority = django_filters.ChoiceFilter(choices=Task.PRIORITY_CHOICES)
+    assignee = django_filters.NumberFilter(field_name='assignee')
+    milestone = django_filters.NumberFilter(field_name='milestone')
+    project = django_filters.NumberFilter(field_name='milestone__project')
+    due_after = django_filters.DateFilter(field_name='milestone__due_date', lookup_expr='gte')
+    due_before = django_filters.DateFilter(field_name='milestone__due_date', lookup_expr='lte')
+
+    class Meta:
+        model = Task
+        fields = ['status', 'priority', 'assignee', 'milestone', 'project', 'due_after', 'due_before']
@@ -0,0 +1,199 @@
+import csv
+import io
+import json
+from collections import Counter
+from itertools import islice
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from .models import User, Project, Milestone, Task, ProjectStats, SearchEntry
+from .serializers import MilestoneSerializer, ProjectSerializer, TaskSerializer, collect_ids
+from .visibility import invalidate_project_visibility
+
+IMPORT_FORMATS = ('csv', 'ndjson')
+
+
+def read_records(stream, import_format):
+    """
+    Yield (line, row, error) for each record of a binary CSV or NDJSON
+    stream without reading it into memory. Empty CSV cells are dropped so
+    they count as missing rather than as empty values.
+    """
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+    try:
+        if import_format == 'csv':
+            reader = csv.DictReader(text)
+            for row in reader:
+                yield reader.line_num, {key: value for key, value in row.items() if key and value not in ('', None)}, None
+            return
+        for line, raw in enumerate(text, start=1):
+            if not raw.strip():
+                continue
+            try:
+                row = json.loads(raw)
+            except ValueError:
+                yield line, None, 'Invalid JSON.'
+                continue
+            if isinstance(row, dict):
+                yield line, row, None
+            else:
+                yield line, None, 'Expected a JSON object.'
+    except UnicodeDecodeError:
+        yield None, None, 'File is not valid UTF-8.'
+    finally:
+        # Leave the underlying upload open for its owner to close
+        text.detach()
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def resolve_users(rows, key):
+    """
+    Users referenced under `key` by id or username, with one query for the
+    whole batch. Usernames are replaced by ids in the rows so the serializer
+    fields only ever see primary keys.
+    """
+    names = {row[key] for row in rows if isinstance(row.get(key), str) and not row[key].isdigit()}
+    matches = User.objects.filter(Q(pk__in=collect_ids(rows, key)) | Q(username__in=names))
+    users = {}
+    by_name = {}
+    for user in matches:
+        users[user.pk] = by_name[user.username] = user
+    for row in rows:
+        user = by_name.get(row[key]) if isinstance(row.get(key), str) else None
+        if user is not None:
+            row[key] = user.pk
+    return users
+
+
+class Importer:
+    """
+    Validate and insert one model's rows a batch at a time: every reference
+    in a batch is looked up with one query, valid rows go in with a single
+    bulk_create, and invalid rows are reported by line without stopping the
+    run. Subclasses set `serializer_class` and refresh whatever the skipped
+    post_save handlers would have maintained in `after_create()`.
+    """
+    model = None
+    serializer_class = None
+
+    def __init__(self, user=None):
+        self.user = user
+
+    def get_related_objects(self, rows):
+        """Objects for PrefetchedPrimaryKeyRelatedField lookups, keyed by field name"""
+        return {}
+
+    def build(self, row, validated_data):
+        """Unsaved instance for a valid row, or a dict of errors"""
+        return self.model(**validated_data)
+
+    def after_create(self, objects):
+        pass
+
+    def run(self, records, batch_size=None):
+        result = {'created': [], 'errors': []}
+        for batch in batched(records, batch_size or settings.IMPORT_BATCH_SIZE):
+            self.import_batch(batch, result)
+        return result
+
+    def import_batch(self, batch, result):
+        errors = result['errors']
+        rows = []
+        for line, row, error in batch:
+            if error:
+                errors.append({'line': line, 'errors': {'non_field_errors': [error]}})
+            else:
+                rows.append((line, row))
+        self.related_objects = self.get_related_objects([row for _, row in rows])
+        context = {'related_objects': self.related_objects}
+        lines = []
+        objects = []
+        for line, row in rows:
+            serializer = self.serializer_class(data=row, context=context)
+            if not serializer.is_valid():
+                errors.append({'line': line, 'errors': serializer.errors})
+                continue
+            instance = self.build(row, serializer.validated_data)
+            if isinstance(instance, dict):
+                errors.append({'line': line, 'errors': instance})
+                continue
+            lines.append(line)
+            objects.append(instance)
+        if not objects:
+            return
+        try:
+            with transaction.atomic():
+                created = self.model.objects.bulk_create(objects)
+                self.after_create(created)
+        except IntegrityError as exc:
+            errors.extend({'line': line, 'errors': {'non_field_errors': [str(exc)]}} for line in lines)
+            return
+        result['created'].extend({'line': line, 'id': instance.pk} for line, instance in zip(lines, created))
+
+
+class ProjectImporter(Importer):
+    """Rows: name, description, start_date, end_date, owner (id or username; defaults to the importing user)"""
+    model = Project
+    serializer_class = ProjectSerializer
+
+    def get_related_objects(self, rows):
+        return {'owner': resolve_users(rows, 'owner')}
+
+    def build(self, row, validated_data):
+        owner = self.user
+        if 'owner' in row:
+            try:
+                owner = self.related_objects['owner'].get(int(row['owner']))
+            except (TypeError, ValueError):
+                owner = None
+            if owner is None:
+                return {'owner': [f"User \"{row['owner']}\" does not exist."]}
+        if owner is None:
+            return {'owner': ['This field is required.']}
+        return Project(owner=owner, **validated_data)
+
+    def after_create(self, projects):
+        ProjectStats.rebuild([project.pk for project in projects])
+        SearchEntry.upsert([SearchEntry.for_project(project) for project in projects])
+        invalidate_project_visibility(*{project.owner_id for project in projects})
+
+
+class MilestoneImporter(Importer):
+    """Rows: title, due_date, project (id)"""
+    model = Milestone
+    serializer_class = MilestoneSerializer
+
+    def get_related_objects(self, rows):
+        return {'project': Project.objects.in_bulk(collect_ids(rows, 'project'))}
+
+    def after_create(self, milestones):
+        for project_id, count in sorted(Counter(milestone.project_id for milestone in milestones).items()):
+            ProjectStats.apply_delta(project_id, milestone_count=count)
+
+
+class TaskImporter(Importer):
+    """Rows: title, description, status, priority, milestone (id), assignee (id or username)"""
+    model = Task
+    serializer_class = TaskSerializer
+
+    def get_related_objects(self, rows):
+        return {
+            'assignee': resolve_users(rows, 'assignee'),
+            'milestone': Milestone.objects.in_bulk(collect_ids(rows, 'milestone')),
+        }
+
+    def after_create(self, tasks):
+        ProjectStats.apply_task_changes((None, task.get_project_rollup_state()) for task in tasks)
+        SearchEntry.index_tasks(tasks)
+
+
+IMPORTERS = {
+    'projects': ProjectImporter,
+    'milestones': MilestoneImporter,
+    'tasks': TaskImporter,
+}
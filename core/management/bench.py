@@ -0,0 +1,25 @@
+import statistics
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+
+ROLLED_BACK_HELP = "The rows are seeded inside a transaction that is rolled back, so the database is left untouched."
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is rolled back when it ends, for the bench_* commands"""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def median_seconds(run, repeat):
+    """Median wall time of `repeat` calls to run()"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
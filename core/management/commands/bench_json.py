@@ -0,0 +1,88 @@
+from datetime import date
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from core.management.bench import ROLLED_BACK_HELP, median_seconds, rolled_back
+from core.models import Comment, Milestone, Project, ProjectStats, Task, User
+from core.parsers import FastJSONParser
+from core.renderers import FastJSONRenderer, orjson
+from core.serializers import CommentSerializer, MilestoneSerializer, ProjectStatsSerializer, TaskSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the stdlib JSON renderer and parser with FastJSONRenderer/FastJSONParser "
+        f"on list responses built by the real serializers. {ROLLED_BACK_HELP}"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', nargs='+', type=int, default=[500, 5000], help='Rows per payload')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per encoder')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"orjson: {'installed' if orjson else 'not installed, FastJSON* use the stdlib'}")
+        self.stdout.write("Median MB/s per payload (render = encode the response, parse = decode it back)")
+        self.stdout.write(
+            f"{'payload':>12} {'rows':>6} {'size KB':>9} {'stdlib out':>11} {'fast out':>9} "
+            f"{'stdlib in':>10} {'fast in':>8}"
+        )
+        for row_count in options['rows']:
+            with rolled_back():
+                self.run_scenario(row_count, options['repeat'])
+
+    def seed(self, row_count):
+        user = User.objects.create(username='bench_user', role='manager')
+        projects = Project.objects.bulk_create(
+            Project(name=f'Bench {index}', description='Bench project', start_date=date.today(),
+                    end_date=date.today(), owner=user)
+            for index in range(max(row_count // 50, 1))
+        )
+        milestones = Milestone.objects.bulk_create(
+            Milestone(title=f'Bench milestone {index}', due_date=date.today(), project=projects[index % len(projects)])
+            for index in range(row_count)
+        )
+        tasks = Task.objects.bulk_create(
+            (
+                Task(title=f'Bench task {index}', description='Ünïcode description ✓ ' * 4,
+                     logged_hours=Decimal(index % 400) / 4, milestone=milestones[index], assignee=user)
+                for index in range(row_count)
+            ),
+            batch_size=1000,
+        )
+        Comment.objects.bulk_create(
+            (Comment(task=task, user=user, content=f'Bench comment on {task.title}') for task in tasks),
+            batch_size=1000,
+        )
+        ProjectStats.rebuild([project.pk for project in projects])
+
+    def median_mb_per_second(self, run, size, repeat):
+        return size / median_seconds(run, repeat) / 1_000_000
+
+    def run_scenario(self, row_count, repeat):
+        self.seed(row_count)
+        payloads = (
+            ('tasks', TaskSerializer(Task.objects.order_by('-id'), many=True).data),
+            ('comments', CommentSerializer(Comment.objects.order_by('-id'), many=True).data),
+            ('milestones', MilestoneSerializer(Milestone.objects.order_by('-id'), many=True).data),
+            # total_hours is a raw Decimal here, encoded through the JSONEncoder fallback
+            ('stats', ProjectStatsSerializer(ProjectStats.objects.order_by('pk'), many=True).data),
+        )
+        for label, data in payloads:
+            content = JSONRenderer().render(data)
+            if FastJSONRenderer().render(data) != content:
+                self.stderr.write(f"  {label}: FastJSONRenderer output differs from JSONRenderer")
+            size = len(content)
+            results = [
+                self.median_mb_per_second(lambda: renderer.render(data), size, repeat)
+                for renderer in (JSONRenderer(), FastJSONRenderer())
+            ] + [
+                self.median_mb_per_second(lambda: parser.parse(BytesIO(content)), size, repeat)
+                for parser in (JSONParser(), FastJSONParser())
+            ]
+            self.stdout.write(
+                f"{label:>12} {len(data):>6} {size / 1000:>9.0f} "
+                + ' '.join(f"{value:>{width}.1f}" for value, width in zip(results, (11, 9, 10, 8)))
+            )
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from core.management.bench import median_seconds, rolled_back
+from core.models import User
+
+
+FULL_AUTHENTICATION = [
+    'rest_framework.authentication.SessionAuthentication',
+    'rest_framework.authentication.BasicAuthentication',
+    'rest_framework_simplejwt.authentication.JWTAuthentication',
+]
+LEAN_AUTHENTICATION = [
+    'rest_framework_simplejwt.authentication.JWTAuthentication',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure per-request overhead of the full and lean API profiles by calling "
+        "an authenticated endpoint through the whole middleware stack. Runs inside a "
+        "rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=500, help='Timed requests per profile')
+        parser.add_argument('--path', default='/api/me/', help='Endpoint to call with a Bearer token')
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.run(options)
+
+    def run(self, options):
+        user = User.objects.create_user(username='bench_middleware_user', role='user')
+        token = str(RefreshToken.for_user(user).access_token)
+        profiles = (
+            ('full', settings.FULL_MIDDLEWARE, FULL_AUTHENTICATION),
+            ('lean', settings.LEAN_MIDDLEWARE, LEAN_AUTHENTICATION),
+        )
+        results = {}
+        for name, middleware, authentication in profiles:
+            rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_AUTHENTICATION_CLASSES': authentication}
+            with override_settings(MIDDLEWARE=middleware, REST_FRAMEWORK=rest_framework, ALLOWED_HOSTS=['*']):
+                results[name] = self.time_requests(options['path'], token, options['requests'])
+            self.stdout.write(f"{name:>5}: median {results[name]:.1f} us/request")
+        saved = results['full'] - results['lean']
+        self.stdout.write(f"lean saves {saved:.1f} us/request ({saved / results['full'] * 100:.1f}%)")
+
+    def time_requests(self, path, token, count):
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {token}')
+        # Warm up: the first request builds the middleware chain
+        response = client.get(path)
+        if response.status_code != 200:
+            raise RuntimeError(f"{path} returned {response.status_code}")
+        return median_seconds(lambda: client.get(path), count) * 1_000_000
@@ -0,0 +1,62 @@
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from core.management.bench import ROLLED_BACK_HELP, median_seconds, rolled_back
+from core.models import Comment, Milestone, Project, Task, User
+from core.serializers import CommentSerializer, MilestoneSerializer, TaskSerializer
+from core.values import ValuesSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare rows per second of the ModelSerializer list path with the values()-based "
+        f"ValuesSerializer path for tasks, comments and milestones, fetch included. {ROLLED_BACK_HELP}"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', nargs='+', type=int, default=[500, 5000], help='Rows per model to benchmark')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per path')
+
+    def handle(self, *args, **options):
+        self.stdout.write("Median rows per second over the whole list, query and serialization included")
+        self.stdout.write(f"{'model':>10} {'rows':>8} {'serializer':>12} {'values':>12} {'speedup':>8}")
+        for row_count in options['rows']:
+            with rolled_back():
+                self.run_scenario(row_count, options['repeat'])
+
+    def seed(self, row_count):
+        user = User.objects.create(username='bench_user', role='manager')
+        project = Project.objects.create(name='Bench', start_date=date.today(), end_date=date.today(), owner=user)
+        milestones = Milestone.objects.bulk_create(
+            Milestone(title=f'Bench milestone {index}', due_date=date.today(), project=project)
+            for index in range(row_count)
+        )
+        tasks = Task.objects.bulk_create(
+            (
+                Task(title=f'Bench task {index}', description='Bench description', logged_hours=Decimal('1.25'),
+                     milestone=milestones[index % len(milestones)], assignee=user if index % 2 else None)
+                for index in range(row_count)
+            ),
+            batch_size=1000,
+        )
+        Comment.objects.bulk_create(
+            (Comment(task=tasks[index], user=user, content=f'Bench comment {index}') for index in range(row_count)),
+            batch_size=1000,
+        )
+
+    def run_scenario(self, row_count, repeat):
+        self.seed(row_count)
+        cases = (
+            ('task', TaskSerializer, Task.objects.order_by('-id')),
+            ('comment', CommentSerializer, Comment.objects.order_by('-id')),
+            ('milestone', MilestoneSerializer, Milestone.objects.order_by('-id')),
+        )
+        for label, serializer_class, queryset in cases:
+            values_serializer = ValuesSerializer(serializer_class)
+            serializer_time = median_seconds(lambda: serializer_class(queryset.all(), many=True).data, repeat)
+            values_time = median_seconds(lambda: values_serializer.serialize(values_serializer.values(queryset)), repeat)
+            self.stdout.write(
+                f"{label:>10} {row_count:>8} {row_count / serializer_time:>12.0f} "
+                f"{row_count / values_time:>12.0f} {serializer_time / values_time:>7.1f}x"
+            )
@@ -0,0 +1,89 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from core.management.bench import ROLLED_BACK_HELP, median_seconds, rolled_back
+from core.models import Milestone, Project, ProjectMember, Task, User
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the OR-join + DISTINCT task visibility filter with the EXISTS-based "
+        f"Task.objects.visible_to() on synthetic data, one scenario per task and member count. {ROLLED_BACK_HELP}"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--tasks', nargs='+', type=int, default=[1000, 10000], help='Task counts to benchmark')
+        parser.add_argument('--members', nargs='+', type=int, default=[5, 50], help='Members per project to benchmark')
+        parser.add_argument('--projects', type=int, default=50, help='Number of projects')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--explain', action='store_true', help='Print the query plan of each variant')
+
+    def handle(self, *args, **options):
+        self.stdout.write("Median ms per query; 'page' is the first 50 rows by -id, 'full' is every visible id")
+        self.stdout.write(
+            f"{'tasks':>8} {'members':>8} {'visible':>8} "
+            f"{'or page':>12} {'exists page':>12} {'or full':>12} {'exists full':>12}"
+        )
+        for task_count in options['tasks']:
+            for member_count in options['members']:
+                with rolled_back():
+                    self.run_scenario(task_count, member_count, options)
+
+    def seed(self, task_count, member_count, project_count):
+        owner = User.objects.create(username='bench_owner', role='manager')
+        # Each project gets `member_count` members drawn from a pool four times that
+        # size, so the sampled user belongs to roughly a quarter of the projects
+        users = User.objects.bulk_create(
+            User(username=f'bench_user_{index}', role='user') for index in range(max(member_count * 4, 1))
+        )
+        projects = Project.objects.bulk_create(
+            Project(name=f'Bench {index}', start_date=date.today(), end_date=date.today(), owner=owner)
+            for index in range(project_count)
+        )
+        # The bench bypasses the 2-project cap on purpose to scale membership
+        ProjectMember.objects.bulk_create(
+            ProjectMember(project=project, user=users[(index * member_count + offset) % len(users)])
+            for index, project in enumerate(projects) for offset in range(member_count)
+        )
+        milestones = Milestone.objects.bulk_create(
+            Milestone(title='Bench', due_date=date.today(), project=project) for project in projects
+        )
+        Task.objects.bulk_create(
+            (
+                Task(title=f'Bench task {index}', milestone=milestones[index % len(milestones)],
+                     assignee=users[index % len(users)])
+                for index in range(task_count)
+            ),
+            batch_size=1000,
+        )
+        return users[0]
+
+    def legacy_queryset(self, user):
+        return Task.objects.filter(
+            Q(assignee=user) |
+            Q(milestone__project__owner=user) |
+            Q(milestone__project__projectmembership__user=user)
+        ).distinct()
+
+    def time_query(self, queryset, repeat):
+        """Median milliseconds to fetch the first page and to fetch every visible id"""
+        page = median_seconds(lambda: list(queryset.order_by('-id').values_list('id', flat=True)[:50]), repeat)
+        full = median_seconds(lambda: list(queryset.values_list('id', flat=True)), repeat)
+        return page * 1000, full * 1000, queryset.count()
+
+    def run_scenario(self, task_count, member_count, options):
+        user = self.seed(task_count, member_count, options['projects'])
+        legacy = self.legacy_queryset(user)
+        exists = Task.objects.visible_to(user)
+        legacy_page, legacy_full, rows = self.time_query(legacy, options['repeat'])
+        exists_page, exists_full, _ = self.time_query(exists, options['repeat'])
+        self.stdout.write(
+            f"{task_count:>8} {member_count:>8} {rows:>8} "
+            f"{legacy_page:>12.2f} {exists_page:>12.2f} {legacy_full:>12.2f} {exists_full:>12.2f}"
+        )
+        if options['explain']:
+            for label, queryset in (('or+distinct', legacy), ('exists', exists)):
+                self.stdout.write(f"  {label} plan:")
+                for line in queryset.order_by('-id')[:50].explain().splitlines():
+                    self.stdout.write(f"    {line}")
@@ -0,0 +1,37 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from core.imports import IMPORT_FORMATS, IMPORTERS, read_records
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = "Create projects, milestones or tasks from a CSV or NDJSON file, reporting invalid rows by line"
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(IMPORTERS))
+        parser.add_argument('path')
+        parser.add_argument(
+            '--as', dest='import_format', choices=IMPORT_FORMATS,
+            help='File format (default: guessed from the file name)'
+        )
+        parser.add_argument('--owner', help='Username owning imported projects that have no owner column')
+        parser.add_argument('--batch-size', type=int, help='Rows per batch (default: IMPORT_BATCH_SIZE)')
+
+    def handle(self, *args, **options):
+        owner = None
+        if options['owner']:
+            owner = User.objects.filter(username=options['owner']).first()
+            if owner is None:
+                raise CommandError(f"User \"{options['owner']}\" does not exist.")
+        path = options['path']
+        import_format = options['import_format'] or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+        try:
+            with open(path, 'rb') as stream:
+                result = IMPORTERS[options['kind']](owner).run(read_records(stream, import_format), options['batch_size'])
+        except OSError as exc:
+            raise CommandError(str(exc))
+        for error in result['errors']:
+            self.stderr.write(f"line {error['line']}: {json.dumps(error['errors'])}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {len(result['created'])} {options['kind']}, skipped {len(result['errors'])} invalid row(s)"
+        ))
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.models import ProjectStats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the ProjectStats rollups from tasks and milestones, or verify them with --verify"
+
+    def add_arguments(self, parser):
+        parser.add_argument('project_ids', nargs='*', type=int, help='Limit to these project ids (default: all projects)')
+        parser.add_argument('--verify', action='store_true', help='Report rollups that differ from the source tables without changing them')
+
+    def handle(self, *args, **options):
+        project_ids = options['project_ids'] or None
+        if not options['verify']:
+            stats = ProjectStats.rebuild(project_ids)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt stats for {len(stats)} project(s)"))
+            return
+
+        fields = ['total_hours', 'milestone_count', *ProjectStats.STATUS_FIELDS.values()]
+        expected = ProjectStats.compute(project_ids)
+        stored = ProjectStats.objects.in_bulk(list(expected.keys()))
+        mismatches = 0
+        for project_id, computed in expected.items():
+            current = stored.get(project_id)
+            if current is None:
+                mismatches += 1
+                self.stdout.write(f"Project {project_id}: missing stats row")
+                continue
+            for field in fields:
+                if getattr(current, field) != getattr(computed, field):
+                    mismatches += 1
+                    self.stdout.write(
+                        f"Project {project_id}: {field} is {getattr(current, field)}, expected {getattr(computed, field)}"
+                    )
+        if mismatches:
+            raise CommandError(f"Found {mismatches} stale rollup value(s); run without --verify to rebuild")
+        self.stdout.write(self.style.SUCCESS(f"Stats for {len(expected)} project(s) are consistent"))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from core.models import SearchEntry
+
+
+class Command(BaseCommand):
+    help = "Recreate the search index entries for all projects, tasks and comments"
+
+    def handle(self, *args, **options):
+        count = SearchEntry.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {count} search entries"))
@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from core.models import MAX_PROJECTS_PER_USER
+
+
+class Command(BaseCommand):
+    help = (
+        f"List users who are members of more than {MAX_PROJECTS_PER_USER} projects, which blocks "
+        "migration 0008, and with --remove delete their newest memberships beyond the cap"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--remove', action='store_true',
+            help="Keep each listed user's oldest memberships and delete the rest"
+        )
+
+    def get_models(self):
+        # The models as of migration 0007, so this runs before 0008 is applied and the
+        # delete skips the post_delete handlers, whose tables may not exist yet
+        apps = MigrationLoader(connection).project_state(('core', '0007_user_project_count')).apps
+        return apps.get_model('core', 'User'), apps.get_model('core', 'ProjectMember')
+
+    def handle(self, *args, **options):
+        User, ProjectMember = self.get_models()
+        over_cap = list(
+            ProjectMember.objects.order_by().values('user').annotate(count=Count('pk'))
+            .filter(count__gt=MAX_PROJECTS_PER_USER).values_list('user', flat=True)
+        )
+        extra = []
+        for user_id in over_cap:
+            memberships = ProjectMember.objects.filter(user_id=user_id).order_by('joined_at', 'pk')
+            extra.extend(memberships.values_list('pk', 'user_id', 'project_id')[MAX_PROJECTS_PER_USER:])
+        if not extra:
+            self.stdout.write(self.style.SUCCESS(f"No user is a member of more than {MAX_PROJECTS_PER_USER} projects"))
+            return
+
+        self.stdout.write(f"{len(extra)} membership(s) beyond each user's {MAX_PROJECTS_PER_USER} oldest:")
+        for _, user_id, project_id in extra:
+            self.stdout.write(f"  user {user_id} in project {project_id}")
+        if not options['remove']:
+            raise CommandError("Resolve these memberships, or run again with --remove to delete them")
+
+        with transaction.atomic():
+            ProjectMember.objects.filter(pk__in=[pk for pk, _, _ in extra]).delete()
+            memberships = ProjectMember.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(count=Count('pk')).values('count')
+            User.objects.filter(pk__in=over_cap).update(project_count=Coalesce(Subquery(memberships), 0))
+        self.stdout.write(self.style.SUCCESS(f"Removed {len(extra)} membership(s)"))
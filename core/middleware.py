@@ -0,0 +1,64 @@
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+class BrowserOnlyMiddleware:
+    """
+    Run the middleware listed in settings.BROWSER_ONLY_MIDDLEWARE (sessions,
+    CSRF, messages, clickjacking...) for every request except those under
+    settings.API_PATH_PREFIX, which go straight to the next handler.
+    The wrapped middleware keep their relative order, including their
+    process_view/process_exception/process_template_response hooks.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.api_prefix = settings.API_PATH_PREFIX
+        self.middleware = []
+        handler = get_response
+        for middleware_path in reversed(settings.BROWSER_ONLY_MIDDLEWARE):
+            try:
+                middleware = import_string(middleware_path)(handler)
+            except MiddlewareNotUsed:
+                continue
+            self.middleware.insert(0, middleware)
+            handler = convert_exception_to_response(middleware)
+        self.browser_handler = handler
+
+    def is_api_request(self, request):
+        return request.path_info.startswith(self.api_prefix)
+
+    def __call__(self, request):
+        if self.is_api_request(request):
+            return self.get_response(request)
+        return self.browser_handler(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if self.is_api_request(request):
+            return None
+        for middleware in self.middleware:
+            if hasattr(middleware, 'process_view'):
+                response = middleware.process_view(request, view_func, view_args, view_kwargs)
+                if response is not None:
+                    return response
+        return None
+
+    def process_exception(self, request, exception):
+        if self.is_api_request(request):
+            return None
+        for middleware in reversed(self.middleware):
+            if hasattr(middleware, 'process_exception'):
+                response = middleware.process_exception(request, exception)
+                if response is not None:
+                    return response
+        return None
+
+    def process_template_response(self, request, response):
+        if self.is_api_request(request):
+            return response
+        for middleware in reversed(self.middleware):
+            if hasattr(middleware, 'process_template_response'):
+                response = middleware.process_template_response(request, response)
+        return response
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def build_project_stats(apps, schema_editor):
+    Project = apps.get_model('core', 'Project')
+    ProjectStats = apps.get_model('core', 'ProjectStats')
+    Task = apps.get_model('core', 'Task')
+    Milestone = apps.get_model('core', 'Milestone')
+
+    stats = {project_id: ProjectStats(project_id=project_id) for project_id in Project.objects.values_list('pk', flat=True)}
+    task_totals = Task.objects.values('milestone__project_id').annotate(
+        total_hours=Sum('logged_hours'),
+        todo_count=Count('pk', filter=Q(status='todo')),
+        in_progress_count=Count('pk', filter=Q(status='in_progress')),
+        done_count=Count('pk', filter=Q(status='done')),
+    ).order_by()
+    for row in task_totals:
+        project_stats = stats[row['milestone__project_id']]
+        project_stats.total_hours = row['total_hours'] or 0
+        project_stats.todo_count = row['todo_count']
+        project_stats.in_progress_count = row['in_progress_count']
+        project_stats.done_count = row['done_count']
+    for row in Milestone.objects.values('project_id').annotate(count=Count('pk')).order_by():
+        stats[row['project_id']].milestone_count = row['count']
+    ProjectStats.objects.bulk_create(stats.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_projectmember'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectStats',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='core.project')),
+                ('total_hours', models.DecimalField(decimal_places=2, default=0, max_digits=12)),
+                ('todo_count', models.PositiveIntegerField(default=0)),
+                ('in_progress_count', models.PositiveIntegerField(default=0)),
+                ('done_count', models.PositiveIntegerField(default=0)),
+                ('milestone_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Project Stats',
+                'verbose_name_plural': 'Project Stats',
+            },
+        ),
+        migrations.RunPython(build_project_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_projectstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hours', models.DecimalField(decimal_places=2, max_digits=5)),
+                ('logged_at', models.DateTimeField(auto_now_add=True)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_entries', to='core.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Time Entry',
+                'verbose_name_plural': 'Time Entries',
+                'indexes': [models.Index(fields=['user', 'logged_at'], name='core_timeentry_user_logged'), models.Index(fields=['task', 'logged_at'], name='core_timeentry_task_logged')],
+            },
+        ),
+    ]
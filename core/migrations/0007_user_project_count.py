@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+PREFIX_INDEXES = {
+    'core_user_username_prefix_idx': 'username',
+    'core_user_email_prefix_idx': 'email',
+}
+
+
+def count_memberships(apps, schema_editor):
+    User = apps.get_model('core', 'User')
+    ProjectMember = apps.get_model('core', 'ProjectMember')
+    memberships = ProjectMember.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(count=Count('pk')).values('count')
+    User.objects.update(project_count=Coalesce(Subquery(memberships), 0))
+
+
+def create_prefix_indexes(apps, schema_editor):
+    # Case-insensitive prefix search runs LOWER(column) LIKE 'term%'; PostgreSQL
+    # only uses an index for that with the pattern operator class
+    opclass = ' text_pattern_ops' if schema_editor.connection.vendor == 'postgresql' else ''
+    for name, column in PREFIX_INDEXES.items():
+        schema_editor.execute(f'CREATE INDEX {name} ON core_user (LOWER({column}){opclass})')
+
+
+def drop_prefix_indexes(apps, schema_editor):
+    for name in PREFIX_INDEXES:
+        schema_editor.execute(f'DROP INDEX {name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0006_timeentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='project_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of projects the user is a member of (maintained on membership changes)'),
+        ),
+        # 2 is MAX_PROJECTS_PER_USER as of this migration. The value is frozen on purpose:
+        # if the constant changes, makemigrations sees the model's index differ and adds
+        # a migration that rebuilds it
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(condition=models.Q(('project_count__lt', 2)), fields=['role', 'username'], name='core_user_assignable_idx'),
+        ),
+        migrations.RunPython(count_memberships, migrations.RunPython.noop),
+        migrations.RunPython(create_prefix_indexes, drop_prefix_indexes),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:16
+
+from django.core.management.base import CommandError
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+MAX_PROJECTS_PER_USER = 2
+
+
+def check_memberships_within_cap(apps, schema_editor):
+    """
+    The unlocked checks before this migration let concurrent requests push a
+    user past the cap, which would make AddConstraint fail. Rather than pick
+    memberships to drop, stop and list them; `manage.py
+    trim_project_memberships` reviews and resolves them. Then recount
+    project_count so the constraint holds for the counter too.
+    """
+    User = apps.get_model('core', 'User')
+    ProjectMember = apps.get_model('core', 'ProjectMember')
+    over_cap = (
+        ProjectMember.objects.order_by().values('user').annotate(count=Count('pk'))
+        .filter(count__gt=MAX_PROJECTS_PER_USER).values_list('user', flat=True)
+    )
+    pairs = list(
+        ProjectMember.objects.filter(user__in=list(over_cap)).order_by('user_id', 'joined_at', 'pk')
+        .values_list('user_id', 'project_id')
+    )
+    if pairs:
+        listing = '\n'.join(f"  user {user_id} in project {project_id}" for user_id, project_id in pairs)
+        raise CommandError(
+            f"Some users are members of more than {MAX_PROJECTS_PER_USER} projects:\n{listing}\n"
+            "Remove the extra memberships (`python manage.py trim_project_memberships` lists them "
+            "and, with --remove, keeps each user's oldest ones), then migrate again."
+        )
+    memberships = ProjectMember.objects.filter(user=OuterRef('pk')).order_by().values('user').annotate(count=Count('pk')).values('count')
+    User.objects.update(project_count=Coalesce(Subquery(memberships), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('core', '0007_user_project_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_memberships_within_cap, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='user',
+            constraint=models.CheckConstraint(condition=models.Q(('project_count__lte', 2)), name='core_user_project_count_max'),
+        ),
+    ]
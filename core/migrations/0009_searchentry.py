@@ -0,0 +1,110 @@
+# Generated by Django 5.2.18 on 2026-10-17 04:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+POSTGRES_INDEX = [
+    """
+    ALTER TABLE core_searchentry ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', title), 'A') || setweight(to_tsvector('english', body), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX core_searchentry_vector_idx ON core_searchentry USING GIN (search_vector)',
+]
+
+# External-content FTS5 table kept in sync by triggers. Django rebuilds SQLite
+# tables on most ALTERs, which drops triggers: a later migration that alters
+# core_searchentry has to recreate them.
+SQLITE_INDEX = [
+    """
+    CREATE VIRTUAL TABLE core_searchentry_fts USING fts5(
+        title, body, content='core_searchentry', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_insert AFTER INSERT ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_delete AFTER DELETE ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER core_searchentry_fts_update AFTER UPDATE OF title, body ON core_searchentry BEGIN
+        INSERT INTO core_searchentry_fts(core_searchentry_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO core_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+    END
+    """,
+]
+
+SQLITE_DROP = [
+    'DROP TRIGGER core_searchentry_fts_update',
+    'DROP TRIGGER core_searchentry_fts_delete',
+    'DROP TRIGGER core_searchentry_fts_insert',
+    'DROP TABLE core_searchentry_fts',
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'postgresql': POSTGRES_INDEX, 'sqlite': SQLITE_INDEX}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    # The PostgreSQL column and index go away with the table
+    if schema_editor.connection.vendor == 'sqlite':
+        for statement in SQLITE_DROP:
+            schema_editor.execute(statement)
+
+
+def index_existing_rows(apps, schema_editor):
+    SearchEntry = apps.get_model('core', 'SearchEntry')
+    Project = apps.get_model('core', 'Project')
+    Task = apps.get_model('core', 'Task')
+    Comment = apps.get_model('core', 'Comment')
+    entries = [
+        SearchEntry(kind='project', object_id=pk, project_id=pk, title=name, body=description)
+        for pk, name, description in Project.objects.values_list('pk', 'name', 'description')
+    ]
+    entries += [
+        SearchEntry(kind='task', object_id=pk, project_id=project_id, task_id=pk, title=title, body=description)
+        for pk, project_id, title, description in Task.objects.values_list('pk', 'milestone__project_id', 'title', 'description')
+    ]
+    entries += [
+        SearchEntry(kind='comment', object_id=pk, project_id=project_id, task_id=task_id, body=content)
+        for pk, project_id, task_id, content in Comment.objects.values_list('pk', 'task__milestone__project_id', 'task_id', 'content')
+    ]
+    SearchEntry.objects.bulk_create(entries, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_user_project_count_check'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('task', 'Task'), ('comment', 'Comment'), ('project', 'Project')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('body', models.TextField(blank=True)),
+                ('project', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.project')),
+                ('task', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='core.task')),
+            ],
+            options={
+                'verbose_name': 'Search Entry',
+                'verbose_name_plural': 'Search Entries',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='core_searchentry_object_unique')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(index_existing_rows, migrations.RunPython.noop),
+    ]
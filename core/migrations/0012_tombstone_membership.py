@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 05:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_updated_at_and_tombstones'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='tombstone',
+            name='kind',
+            field=models.CharField(choices=[('project', 'Project'), ('milestone', 'Milestone'), ('task', 'Task'), ('comment', 'Comment'), ('attachment', 'Attachment'), ('membership', 'Membership')], max_length=10),
+        ),
+    ]
@@ -1,6 +1,80 @@
-from django.db import models
+from collections import defaultdict
+from decimal import Decimal
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Subquery, Sum
 from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+# A user can be a member of at most this many projects
+MAX_PROJECTS_PER_USER = 2
+
+# Largest total Task.logged_hours holds (max_digits=5, decimal_places=2)
+MAX_LOGGED_HOURS = Decimal('999.99')
+
+class VisibilityQuerySet(models.QuerySet):
+    """
+    Queryset with a `visible_to(user)` filter shared by the list views.
+    Admins and managers see everything; users see rows of projects they own
+    or are members of, plus rows of tasks assigned to them. Membership is
+    checked with a correlated EXISTS, so rows are never multiplied by the
+    membership join and no DISTINCT is needed.
+    """
+    project_lookup = None   # path from the model to its Project ('' for Project itself)
+    assignee_lookup = None  # path from the model to the task assignee, if any
+
+    def visible_to(self, user, project_ids=None):
+        """
+        Filter to rows the user may see. `project_ids` is the user's cached set
+        of visible projects (see core.visibility); without it ownership and
+        membership are checked in SQL.
+        """
+        if user.is_admin or user.is_manager:
+            return self.all()
+        if project_ids is not None:
+            condition = Q(**{f'{self.project_lookup or "pk"}__in': project_ids})
+        else:
+            prefix = f'{self.project_lookup}__' if self.project_lookup else ''
+            condition = Q(**{f'{prefix}owner': user}) | Exists(
+                ProjectMember.objects.filter(project=OuterRef(self.project_lookup or 'pk'), user=user)
+            )
+        if self.assignee_lookup:
+            condition |= Q(**{self.assignee_lookup: user})
+        return self.filter(condition)
+
+class ProjectQuerySet(VisibilityQuerySet):
+    project_lookup = ''
+
+class MilestoneQuerySet(VisibilityQuerySet):
+    project_lookup = 'project'
+
+class TaskQuerySet(VisibilityQuerySet):
+    project_lookup = 'milestone__project'
+    assignee_lookup = 'assignee'
+
+class TaskRelatedQuerySet(VisibilityQuerySet):
+    project_lookup = 'task__milestone__project'
+    assignee_lookup = 'task__assignee'
+
+class SearchEntryQuerySet(VisibilityQuerySet):
+    project_lookup = 'project'
+    assignee_lookup = 'task__assignee'
+
+class TombstoneQuerySet(models.QuerySet):
+    def visible_to(self, user, project_ids):
+        """
+        Tombstones of rows the user could see, going by the projects in
+        `project_ids` (core.visibility). Deleted projects take their
+        memberships with them, so project tombstones are not filtered; they
+        only expose ids. Membership tombstones go to the removed member only,
+        and not to admins or managers, who keep seeing the project.
+        """
+        if user.is_admin or user.is_manager:
+            return self.exclude(kind='membership')
+        return self.filter(
+            Q(kind='membership', assignee_id=user.pk)
+            | (~Q(kind='membership') & (Q(project_id__in=project_ids) | Q(assignee_id=user.pk) | Q(kind='project')))
+        )
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -15,10 +89,25 @@ class User(AbstractUser):
         default='user',
         help_text='User role in the system'
     )
+    project_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text='Number of projects the user is a member of (maintained on membership changes)'
+    )
     
     class Meta:
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            # Serves the available-users picker: assignable users ordered by username
+            models.Index(fields=['role', 'username'], condition=Q(project_count__lt=MAX_PROJECTS_PER_USER), name='core_user_assignable_idx'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(project_count__lte=MAX_PROJECTS_PER_USER),
+                name='core_user_project_count_max',
+            ),
+        ]
     
     def __str__(self):
         return f"{self.username} ({self.get_role_display()})"
@@ -65,10 +154,20 @@ class Project(models.Model):
     start_date = models.DateField()
     end_date = models.DateField()
     owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='owned_projects')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = ProjectQuerySet.as_manager()
 
     def __str__(self):
         return self.name
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'owner_id' not in instance.get_deferred_fields():
+            instance._loaded_owner_id = instance.owner_id
+        return instance
+    
     @property
     def members(self):
         """Get all project members including owner"""
@@ -93,30 +192,81 @@ class ProjectMember(models.Model):
     def clean(self):
         """Validate constraints before saving"""
         # Constraint 1: Only users can be added to projects
-        if self.user and not self.user.is_user:
+        if self.user_id and not self.user.is_user:
             raise ValidationError({
                 'user': 'Only users with "user" role can be added to projects as members.'
             })
         
         # Constraint 2: One user can be assigned to maximum 2 projects
-        if self.user:
-            existing_projects = ProjectMember.objects.filter(user=self.user).exclude(pk=self.pk).count()
-            if existing_projects >= 2:
-                raise ValidationError({
-                    'user': f'User {self.user.username} is already assigned to {existing_projects} projects. Maximum allowed is 2.'
-                })
+        if self.user_id and self._state.adding and self.user.project_count >= MAX_PROJECTS_PER_USER:
+            raise ValidationError({
+                'user': f'User {self.user.username} is already assigned to {self.user.project_count} projects. Maximum allowed is {MAX_PROJECTS_PER_USER}.'
+            })
     
     def save(self, *args, **kwargs):
-        self.clean()
-        super().save(*args, **kwargs)
+        if not self._state.adding:
+            super().save(*args, **kwargs)
+            return
+        
+        if self.project.owner_id == self.user_id:
+            raise ValidationError({'user': 'Project owner cannot be added as a member.'})
+        
+        with transaction.atomic():
+            # Claim a slot on the user's counter; the role and cap checks happen in the
+            # same conditional UPDATE, and the CHECK constraint backs it up
+            claimed = User.objects.filter(
+                pk=self.user_id,
+                role='user',
+                project_count__lt=MAX_PROJECTS_PER_USER
+            ).update(project_count=F('project_count') + 1)
+            if not claimed:
+                raise self.rejection_error()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+            except IntegrityError:
+                raise ValidationError({'user': 'User is already a member of this project.'})
+    
+    def rejection_error(self):
+        """Explain why the counter update for this membership matched no row"""
+        user = User.objects.filter(pk=self.user_id).first()
+        if user is None:
+            return ValidationError({'user': 'User does not exist.'})
+        if not user.is_user:
+            return ValidationError({'user': 'Only users with "user" role can be added to projects as members.'})
+        return ValidationError({
+            'user': f'User {user.username} is already assigned to {user.project_count} projects. Maximum allowed is {MAX_PROJECTS_PER_USER}.'
+        })
 
 class Milestone(models.Model):
     title = models.CharField(max_length=255)
     due_date = models.DateField()
     project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='milestones')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = MilestoneQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Serve the task list's project and due-date filters
+            models.Index(fields=['project', 'due_date'], name='core_milestone_project_due'),
+            models.Index(fields=['due_date'], name='core_milestone_due'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.project.name})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if 'project_id' not in instance.get_deferred_fields():
+            instance._loaded_project_id = instance.project_id
+        return instance
+    
+    def save(self, *args, **kwargs):
+        # ProjectStats is updated by a post_save handler; keep both writes in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
 class Task(models.Model):
     STATUS_CHOICES = [
@@ -136,22 +286,348 @@ class Task(models.Model):
     assignee = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='tasks')
     milestone = models.ForeignKey(Milestone, on_delete=models.CASCADE, related_name='tasks')
     logged_hours = models.DecimalField(max_digits=5, decimal_places=2, default=0)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TaskQuerySet.as_manager()
+
+    class Meta:
+        # Match the task list filters (core.filters.TaskFilter)
+        indexes = [
+            models.Index(fields=['assignee', 'status'], name='core_task_assignee_status'),
+            models.Index(fields=['milestone', 'status'], name='core_task_milestone_status'),
+            models.Index(fields=['status', 'priority'], name='core_task_status_priority'),
+            models.Index(fields=['priority', 'status'], name='core_task_priority_status'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.status})"
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the rolled-up fields as loaded so saves can apply deltas
+        if not instance.get_deferred_fields() & {'milestone_id', 'status', 'logged_hours'}:
+            instance._rollup_state = instance.get_rollup_state()
+        return instance
+    
+    def get_rollup_state(self):
+        """Fields of this task that feed ProjectStats"""
+        logged_hours = self._meta.get_field('logged_hours').to_python(self.logged_hours)
+        return (self.milestone_id, self.status, logged_hours)
+    
+    def get_project_rollup_state(self):
+        """(project id, status, logged hours) for ProjectStats.apply_task_changes; reads the milestone"""
+        return (self.milestone.project_id, self.status, self.logged_hours)
+    
+    def save(self, *args, **kwargs):
+        # ProjectStats is updated by a post_save handler; keep both writes in one transaction
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
+    def log_time(self, user, hours):
+        """
+        Record hours in the time ledger and add them to the task and project
+        totals. Raises ValidationError when the task total would pass
+        MAX_LOGGED_HOURS.
+        """
+        with transaction.atomic():
+            # Increment in the database so concurrent loggers don't overwrite each other; the
+            # bound is checked in the same UPDATE so the column can't overflow
+            added = Task.objects.filter(pk=self.pk, logged_hours__lte=MAX_LOGGED_HOURS - hours).update(
+                logged_hours=F('logged_hours') + hours, updated_at=timezone.now()
+            )
+            if not added:
+                raise ValidationError({
+                    'hours': f'A task can have at most {MAX_LOGGED_HOURS} logged hours.'
+                })
+            entry = TimeEntry.objects.create(task=self, user=user, hours=hours)
+            ProjectStats.objects.filter(project__milestones=self.milestone_id).update(total_hours=F('total_hours') + hours)
+        self.refresh_from_db(fields=['logged_hours', 'updated_at'])
+        if hasattr(self, '_rollup_state'):
+            self._rollup_state = self.get_rollup_state()
+        return entry
 
 class Comment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='comments')
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='comments')
     content = models.TextField()
     timestamp = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TaskRelatedQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.user.username} on {self.task.title}"
 
+class TimeEntry(models.Model):
+    """Append-only ledger of hours logged against tasks"""
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='time_entries')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='time_entries')
+    hours = models.DecimalField(max_digits=5, decimal_places=2)
+    logged_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Time Entry'
+        verbose_name_plural = 'Time Entries'
+        indexes = [
+            models.Index(fields=['user', 'logged_at'], name='core_timeentry_user_logged'),
+            models.Index(fields=['task', 'logged_at'], name='core_timeentry_task_logged'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username}: {self.hours}h on {self.task.title}"
+
 class Attachment(models.Model):
     task = models.ForeignKey(Task, on_delete=models.CASCADE, related_name='attachments')
     file = models.FileField(upload_to='attachments/')
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    objects = TaskRelatedQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.file.name} ({self.task.title})"
+
+
+class ProjectStats(models.Model):
+    """
+    Rollup of a project's tasks and milestones.
+    Kept up to date by the Task and Milestone signal handlers in core.signals;
+    `rebuild_project_stats` recomputes it from the source tables.
+    """
+    STATUS_FIELDS = {
+        'todo': 'todo_count',
+        'in_progress': 'in_progress_count',
+        'done': 'done_count',
+    }
+
+    project = models.OneToOneField(Project, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    total_hours = models.DecimalField(max_digits=12, decimal_places=2, default=0)
+    todo_count = models.PositiveIntegerField(default=0)
+    in_progress_count = models.PositiveIntegerField(default=0)
+    done_count = models.PositiveIntegerField(default=0)
+    milestone_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Project Stats'
+        verbose_name_plural = 'Project Stats'
+
+    def __str__(self):
+        return f"Stats for project {self.project_id}"
+
+    @property
+    def task_count(self):
+        return self.todo_count + self.in_progress_count + self.done_count
+
+    @property
+    def progress_percent(self):
+        """Percentage of the project's tasks that are done"""
+        if not self.task_count:
+            return 0
+        return round((self.done_count / self.task_count) * 100, 2)
+
+    @classmethod
+    def apply_delta(cls, project_id, **deltas):
+        """Atomically add the given amounts to a project's rollup columns"""
+        updates = {field: F(field) + amount for field, amount in deltas.items() if amount}
+        if project_id is not None and updates:
+            cls.objects.filter(pk=project_id).update(**updates)
+
+    @classmethod
+    def apply_task_changes(cls, changes):
+        """
+        Apply the rollup deltas of many task writes, one UPDATE per project.
+        `changes` holds (old, new) pairs of Task.get_project_rollup_state()
+        values, with None for the side of a created or deleted task.
+        """
+        deltas = defaultdict(lambda: defaultdict(int))
+        for old, new in changes:
+            for state, sign in ((old, -1), (new, 1)):
+                if state is None:
+                    continue
+                project_id, status, hours = state
+                deltas[project_id]['total_hours'] += sign * (hours or 0)
+                if status in cls.STATUS_FIELDS:
+                    deltas[project_id][cls.STATUS_FIELDS[status]] += sign
+        # In id order, so concurrent bulk writes lock the rows in the same order
+        for project_id in sorted(project_id for project_id in deltas if project_id is not None):
+            cls.apply_delta(project_id, **deltas[project_id])
+
+    @classmethod
+    def compute(cls, project_ids=None):
+        """Compute rollups from the source tables, keyed by project id"""
+        projects = Project.objects.all()
+        tasks = Task.objects.all()
+        milestones = Milestone.objects.all()
+        if project_ids is not None:
+            projects = projects.filter(pk__in=project_ids)
+            tasks = tasks.filter(milestone__project_id__in=project_ids)
+            milestones = milestones.filter(project_id__in=project_ids)
+        stats = {project_id: cls(project_id=project_id) for project_id in projects.values_list('pk', flat=True)}
+
+        task_totals = tasks.values('milestone__project_id').annotate(
+            total_hours=Sum('logged_hours'),
+            **{
+                field: Count('pk', filter=Q(status=status))
+                for status, field in cls.STATUS_FIELDS.items()
+            }
+        ).order_by()
+        for row in task_totals:
+            project_stats = stats[row['milestone__project_id']]
+            project_stats.total_hours = row['total_hours'] or Decimal('0')
+            for field in cls.STATUS_FIELDS.values():
+                setattr(project_stats, field, row[field])
+
+        milestone_totals = milestones.values('project_id').annotate(count=Count('pk')).order_by()
+        for row in milestone_totals:
+            stats[row['project_id']].milestone_count = row['count']
+        return stats
+
+    @classmethod
+    def rebuild(cls, project_ids=None):
+        """Recompute and store rollups for the given projects (all by default)"""
+        stats = cls.compute(project_ids)
+        cls.objects.bulk_create(
+            stats.values(),
+            update_conflicts=True,
+            unique_fields=['project'],
+            update_fields=['total_hours', 'milestone_count', *cls.STATUS_FIELDS.values()],
+        )
+        return stats
+
+    @classmethod
+    def get_for_project(cls, project_id):
+        """Return the rollup for a project, rebuilding it if missing; None if the project does not exist"""
+        stats = cls.objects.filter(pk=project_id).first()
+        if stats is None:
+            stats = cls.rebuild([project_id]).get(project_id)
+        return stats
+
+
+class SearchEntry(models.Model):
+    """
+    One row per searchable task, comment or project, kept current by the
+    signal handlers in core.signals. The full-text index itself lives in the
+    database: a generated tsvector column with a GIN index on PostgreSQL and
+    an FTS5 table synced by triggers on SQLite (see migration 0009 and
+    core.search). `rebuild_search_index` recreates the rows from the source
+    tables.
+    """
+    KIND_CHOICES = [
+        ('task', 'Task'),
+        ('comment', 'Comment'),
+        ('project', 'Project'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    project = models.ForeignKey(Project, on_delete=models.CASCADE, related_name='+')
+    # The task itself for task rows, the commented task for comment rows
+    task = models.ForeignKey(Task, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    title = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+
+    objects = SearchEntryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Search Entry'
+        verbose_name_plural = 'Search Entries'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='core_searchentry_object_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
+
+    @classmethod
+    def for_project(cls, project):
+        return cls(kind='project', object_id=project.pk, project_id=project.pk, title=project.name, body=project.description)
+
+    @classmethod
+    def for_task(cls, task, project_id):
+        return cls(kind='task', object_id=task.pk, project_id=project_id, task_id=task.pk, title=task.title, body=task.description)
+
+    @classmethod
+    def for_comment(cls, comment, project_id):
+        return cls(kind='comment', object_id=comment.pk, project_id=project_id, task_id=comment.task_id, body=comment.content)
+
+    @classmethod
+    def upsert(cls, entries):
+        """Insert or refresh the given entries in one statement"""
+        return cls.objects.bulk_create(
+            entries,
+            update_conflicts=True,
+            unique_fields=['kind', 'object_id'],
+            update_fields=['project', 'task', 'title', 'body'],
+        )
+
+    @classmethod
+    def index_tasks(cls, tasks):
+        """Refresh the entries of tasks (with their milestones loaded) and re-home their comments"""
+        cls.upsert([cls.for_task(task, task.milestone.project_id) for task in tasks])
+        cls.sync_comment_projects(cls.objects.filter(task__in=tasks))
+
+    @classmethod
+    def sync_comment_projects(cls, entries):
+        """Point comment entries at their task's current project"""
+        entries.filter(kind='comment').update(
+            project=Subquery(Milestone.objects.filter(tasks=OuterRef('task_id')).values('project_id')[:1])
+        )
+
+    @classmethod
+    def rebuild(cls, batch_size=1000):
+        """Recreate every entry from the source tables"""
+        entries = [
+            cls(kind='project', object_id=pk, project_id=pk, title=name, body=description)
+            for pk, name, description in Project.objects.values_list('pk', 'name', 'description').iterator()
+        ]
+        entries += [
+            cls(kind='task', object_id=pk, project_id=project_id, task_id=pk, title=title, body=description)
+            for pk, project_id, title, description in Task.objects.values_list(
+                'pk', 'milestone__project_id', 'title', 'description'
+            ).iterator()
+        ]
+        entries += [
+            cls(kind='comment', object_id=pk, project_id=project_id, task_id=task_id, body=content)
+            for pk, project_id, task_id, content in Comment.objects.values_list(
+                'pk', 'task__milestone__project_id', 'task_id', 'content'
+            ).iterator()
+        ]
+        with transaction.atomic():
+            cls.objects.all().delete()
+            cls.objects.bulk_create(entries, batch_size=batch_size)
+        return len(entries)
+
+
+class Tombstone(models.Model):
+    """
+    Record of a deleted project, milestone, task, comment, attachment or
+    project membership, so delta sync clients (`/api/sync/?since=`) learn
+    about deletes. Written by the post_delete handlers in core.signals;
+    `purge_tombstones` drops the ones older than SYNC_TOMBSTONE_RETENTION_DAYS.
+    """
+    KIND_CHOICES = [
+        ('project', 'Project'),
+        ('milestone', 'Milestone'),
+        ('task', 'Task'),
+        ('comment', 'Comment'),
+        ('attachment', 'Attachment'),
+        ('membership', 'Membership'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # The project's id for memberships, whose rows have no id of their own in the API
+    object_id = models.BigIntegerField()
+    # Plain ids rather than foreign keys: the rows are usually gone too
+    project_id = models.BigIntegerField(null=True, blank=True)
+    # The task assignee, or the removed member for memberships
+    assignee_id = models.BigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = TombstoneQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = 'Tombstone'
+        verbose_name_plural = 'Tombstones'
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id} deleted at {self.deleted_at}"
@@ -0,0 +1,165 @@
+import json
+from base64 import b64decode, b64encode
+from urllib import parse
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset pagination with opaque cursors, newest rows first.
+    Pages are fetched with `WHERE id < <cursor>` rather than OFFSET, so the
+    cost of a page does not grow with the size of the table. Orderings on
+    a non-unique field (e.g. ?ordering=status) end with id and seek on the
+    whole (field, id) key, with the position holding both values.
+    """
+    ordering = '-id'
+    page_size = getattr(settings, 'API_PAGE_SIZE', 50)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if not any(self.is_unique(queryset.model, field.lstrip('-')) for field in ordering):
+            ordering += ('-id' if ordering[0].startswith('-') else 'id',)
+        return ordering
+
+    @staticmethod
+    def is_unique(model, name):
+        return name == 'pk' or model._meta.get_field(name).unique
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = [
+            instance[field.lstrip('-')] if isinstance(instance, dict) else getattr(instance, field.lstrip('-'))
+            for field in ordering
+        ]
+        if len(values) == 1:
+            return str(values[0])
+        return json.dumps([str(value) for value in values])
+
+    def get_seek_condition(self, model, position, reverse):
+        """Rows after `position` in the ordering (before it for reverse cursors), key by key"""
+        if len(self.ordering) == 1:
+            values = [position]
+        else:
+            try:
+                values = json.loads(position)
+            except ValueError:
+                values = None
+            if not isinstance(values, list) or len(values) != len(self.ordering):
+                raise NotFound(self.invalid_cursor_message)
+        keys = []
+        for field, value in zip(self.ordering, values):
+            name = field.lstrip('-')
+            try:
+                value = model._meta.get_field(name).to_python(value)
+            except ValidationError:
+                raise NotFound(self.invalid_cursor_message)
+            keys.append((name, field.startswith('-') != reverse, value))
+
+        # (a, b) after (x, y) is a >= x AND (a > x OR b after y): the leading range lets an index seek
+        condition = None
+        for name, descending, value in reversed(keys):
+            after = Q(**{f"{name}__{'lt' if descending else 'gt'}": value})
+            if condition is None:
+                condition = after
+            else:
+                from_value = Q(**{f"{name}__{'lte' if descending else 'gte'}": value})
+                condition = from_value & (after | (Q(**{name: value}) & condition))
+        return condition
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # CursorPagination.paginate_queryset, except that it seeks on every ordering key.
+        # Positions are unique, so the in-page offset DRF falls back to stays at 0
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.get_seek_condition(queryset.model, current_position, reverse))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+class UsernameKeysetPagination(KeysetPagination):
+    """Keyset pagination over users in username order, for pickers and type-ahead"""
+    ordering = 'username'
+
+
+class SearchPagination(PageNumberPagination):
+    """Numbered pages for ranked search results, which have no stable keyset to page on"""
+    page_size = getattr(settings, 'API_PAGE_SIZE', 50)
+    page_size_query_param = 'page_size'
+    max_page_size = getattr(settings, 'API_MAX_PAGE_SIZE', 500)
+
+
+def encode_cursor(**fields):
+    """Opaque cursor carrying the given fields, in the same format as CursorPagination"""
+    return b64encode(parse.urlencode(fields).encode('ascii')).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Fields of an opaque cursor as strings; raises NotFound like CursorPagination for bad cursors"""
+    try:
+        return {key: values[0] for key, values in parse.parse_qs(b64decode(cursor.encode('ascii')).decode('ascii')).items()}
+    except (TypeError, ValueError, UnicodeError):
+        raise NotFound(CursorPagination.invalid_cursor_message)
+
+
+def encode_position(position):
+    """Opaque cursor for a keyset position"""
+    return encode_cursor(p=position)
+
+
+def decode_position(cursor):
+    """Integer position of an opaque cursor; raises NotFound like CursorPagination for bad cursors"""
+    try:
+        return int(decode_cursor(cursor)['p'])
+    except (ValueError, KeyError):
+        raise NotFound(CursorPagination.invalid_cursor_message)
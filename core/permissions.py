@@ -1,5 +1,17 @@
 from rest_framework import permissions
 from .models import User
+from .visibility import get_project_visibility
+
+
+def get_project_id(obj):
+    """Id of the project an object belongs to, following task and milestone links"""
+    if hasattr(obj, 'project_id'):
+        return obj.project_id
+    if hasattr(obj, 'milestone'):
+        return obj.milestone.project_id
+    if hasattr(obj, 'task'):
+        return obj.task.milestone.project_id
+    return None
 
 class IsAdminUser(permissions.BasePermission):
     """
@@ -60,8 +72,8 @@ class IsOwnerOrManagerOrAdmin(permissions.BasePermission):
             return True
         
         # Check if user is the owner
-        if hasattr(obj, 'owner'):
-            return obj.owner == request.user
+        if hasattr(obj, 'owner_id'):
+            return obj.owner_id == request.user.pk
         
         return False
 
@@ -75,8 +87,8 @@ class IsTaskAssigneeOrManagerOrAdmin(permissions.BasePermission):
             return True
         
         # Check if user is the assignee
-        if hasattr(obj, 'assignee'):
-            return obj.assignee == request.user
+        if hasattr(obj, 'assignee_id'):
+            return obj.assignee_id == request.user.pk
         
         return False
 
@@ -90,8 +102,8 @@ class IsProjectOwnerOrManagerOrAdmin(permissions.BasePermission):
             return True
         
         # Check if user is the project owner
-        if hasattr(obj, 'project') and hasattr(obj.project, 'owner'):
-            return obj.project.owner == request.user
+        if hasattr(obj, 'project_id'):
+            return obj.project_id in get_project_visibility(request.user, request).owned_ids
         
         return False
 
@@ -105,8 +117,8 @@ class IsMilestoneProjectOwnerOrManagerOrAdmin(permissions.BasePermission):
             return True
         
         # Check if user is the project owner
-        if hasattr(obj, 'project') and hasattr(obj.project, 'owner'):
-            return obj.project.owner == request.user
+        if hasattr(obj, 'project_id'):
+            return obj.project_id in get_project_visibility(request.user, request).owned_ids
         
         return False
 
@@ -119,14 +131,9 @@ class IsProjectMemberOrManagerOrAdmin(permissions.BasePermission):
         if request.user.is_admin or request.user.is_manager:
             return True
         
-        # Check if user is the project owner
-        if hasattr(obj, 'project') and hasattr(obj.project, 'owner'):
-            if obj.project.owner == request.user:
-                return True
-        
-        # Check if user is a project member
-        if hasattr(obj, 'project'):
-            from .models import ProjectMember
-            return ProjectMember.objects.filter(project=obj.project, user=request.user).exists()
+        # Check if user is the project owner or a project member
+        project_id = get_project_id(obj)
+        if project_id is not None:
+            return project_id in get_project_visibility(request.user, request).visible_ids
         
         return False 
\ No newline at end of file
@@ -0,0 +1,75 @@
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed, producing the
+    same output as the stdlib path (floats in exponent form aside, e.g. 1e16
+    rather than 1e+16): types orjson has no native encoding for
+    (Decimal, lazy strings, querysets, ...) go through DRF's JSONEncoder, UTC
+    datetimes end in "Z" and U+2028/U+2029 are escaped. Indented output
+    (the `indent` media type parameter) and payloads orjson rejects, such as
+    integers beyond 64 bits, fall back to the stdlib encoder.
+    """
+    options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z) if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer: these are valid JSON but end lines in JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    application/msgpack responses with the same structure as the JSON ones:
+    values MessagePack has no type for (Decimal, datetime, date, lazy
+    strings, ...) are converted by DRF's JSONEncoder, so they arrive as the
+    same numbers and ISO 8601 strings a JSON client sees.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+    encoder_class = encoders.JSONEncoder
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=self.encoder_class().default, use_bin_type=True, datetime=False)
+
+
+class ExportRenderer(FastJSONRenderer):
+    """
+    Export media types for content negotiation, so `Accept: text/csv` or
+    `Accept: application/x-ndjson` selects the export format instead of
+    getting 406. ExportMixin streams the body itself, so these only render
+    error payloads, which go out as JSON.
+    """
+
+
+class NDJSONRenderer(ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class CSVRenderer(ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
@@ -0,0 +1,47 @@
+import re
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+WORD_RE = re.compile(r'\w+')
+
+
+def search_terms(query):
+    """Words of a free-text query, with any search operators stripped"""
+    return WORD_RE.findall(query)
+
+
+def search(queryset, query):
+    """
+    Filter a SearchEntry queryset to rows matching `query` and annotate a
+    `rank` (higher is better), using the full-text index of the database.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return queryset.annotate(rank=Value(0.0, output_field=FloatField())).none()
+    if connection.vendor == 'postgresql':
+        tsquery = "websearch_to_tsquery('english', %s)"
+        return queryset.filter(
+            RawSQL(f'core_searchentry.search_vector @@ {tsquery}', [query], output_field=BooleanField())
+        ).annotate(
+            rank=RawSQL(f'ts_rank(core_searchentry.search_vector, {tsquery})', [query], output_field=FloatField())
+        )
+    if connection.vendor == 'sqlite':
+        # Quote each word so user input can't inject FTS5 query syntax; words are ANDed
+        match = ' '.join(f'"{term}"' for term in terms)
+        return queryset.filter(
+            id__in=RawSQL('SELECT rowid FROM core_searchentry_fts WHERE core_searchentry_fts MATCH %s', [match])
+        ).annotate(
+            # bm25() is lower for better matches; titles weigh ten times the body
+            rank=RawSQL(
+                'SELECT -bm25(core_searchentry_fts, 10.0, 1.0) FROM core_searchentry_fts '
+                'WHERE core_searchentry_fts MATCH %s AND rowid = core_searchentry.id',
+                [match],
+                output_field=FloatField()
+            )
+        )
+    # No full-text index on other backends: match every word as a substring
+    condition = Q()
+    for term in terms:
+        condition &= Q(title__icontains=term) | Q(body__icontains=term)
+    return queryset.filter(condition).annotate(rank=Value(0.0, output_field=FloatField()))
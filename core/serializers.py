@@ -1,7 +1,18 @@
 
+from decimal import Decimal
 from rest_framework import serializers
-from .models import User, Project, Milestone, Task, Comment, Attachment, ProjectMember
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Prefetch, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from .models import (
+    MAX_PROJECTS_PER_USER, User, Project, Milestone, Task, Comment, Attachment, ProjectMember, ProjectStats, TimeEntry,
+    SearchEntry
+)
 from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError as DjangoValidationError
+from .visibility import invalidate_project_visibility
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
@@ -86,63 +97,78 @@ class ProjectMemberSerializer(serializers.ModelSerializer):
         fields = ('id', 'user', 'user_id', 'project', 'joined_at')
         read_only_fields = ('joined_at',)
     
-    def validate_user_id(self, value):
-        """Validate that the user exists and has 'user' role"""
+    def create(self, validated_data):
+        # The role, duplicate and project cap checks run inside ProjectMember.save as
+        # one conditional write, so concurrent adds can't race past a pre-count
+        member = ProjectMember(project=validated_data['project'], user_id=validated_data['user_id'])
         try:
-            user = User.objects.get(id=value)
-            if not user.is_user:
-                raise serializers.ValidationError("Only users with 'user' role can be added to projects.")
-            return value
-        except User.DoesNotExist:
-            raise serializers.ValidationError("User does not exist.")
+            member.save()
+        except DjangoValidationError as e:
+            raise serializers.ValidationError({'non_field_errors': e.message_dict.get('user', e.messages)})
+        return member
+
+class ProjectMemberBulkSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(child=serializers.IntegerField(), allow_empty=False)
     
-    def validate(self, attrs):
-        """Validate constraints before creating the project member"""
-        user_id = attrs.get('user_id')
-        project_id = self.context.get('project_id')
-        
-        if user_id and project_id:
-            try:
-                user = User.objects.get(id=user_id)
-                project = Project.objects.get(id=project_id)
-                
-                # Check if user is already a member of this project
-                if ProjectMember.objects.filter(user=user, project=project).exists():
-                    raise serializers.ValidationError("User is already a member of this project.")
-                
-                # Check if user is at maximum limit (2 projects)
-                current_project_count = ProjectMember.objects.filter(user=user).count()
-                if current_project_count >= 2:
-                    raise serializers.ValidationError(
-                        f"User {user.username} is already assigned to {current_project_count} projects. Maximum allowed is 2."
-                    )
-                
-                # Check if user is the project owner (shouldn't be added as member)
-                if project.owner == user:
-                    raise serializers.ValidationError("Project owner cannot be added as a member.")
-                
-            except (User.DoesNotExist, Project.DoesNotExist):
-                raise serializers.ValidationError("Invalid user or project.")
-        
-        return attrs
+    def get_user_ids(self):
+        """Requested user ids in order, without duplicates"""
+        return list(dict.fromkeys(self.validated_data['user_ids']))
     
-    def create(self, validated_data):
-        user_id = validated_data.pop('user_id')
-        user = User.objects.get(id=user_id)
-        validated_data['user'] = user
-        return super().create(validated_data)
+    def add_members(self, project):
+        """Validate every user with set-based queries and add the valid ones in one transaction"""
+        user_ids = self.get_user_ids()
+        errors = []
+        new_members = []
+        with transaction.atomic():
+            # Lock the users so concurrent adds can't push them past the project cap
+            users = User.objects.select_for_update().in_bulk(user_ids)
+            existing_members = set(
+                ProjectMember.objects.filter(project=project, user_id__in=user_ids).values_list('user_id', flat=True)
+            )
+            for user_id in user_ids:
+                user = users.get(user_id)
+                if user is None:
+                    error = "User does not exist."
+                elif not user.is_user:
+                    error = "Only users with 'user' role can be added to projects."
+                elif user_id == project.owner_id:
+                    error = "Project owner cannot be added as a member."
+                elif user_id in existing_members:
+                    error = "User is already a member of this project."
+                elif user.project_count >= MAX_PROJECTS_PER_USER:
+                    error = f"User {user.username} is already assigned to {user.project_count} projects. Maximum allowed is {MAX_PROJECTS_PER_USER}."
+                else:
+                    new_members.append(ProjectMember(project=project, user=user))
+                    continue
+                errors.append({'user_id': user_id, 'error': error})
+            created = ProjectMember.objects.bulk_create(new_members)
+            # bulk_create skips the post_save handlers
+            User.objects.filter(pk__in=[member.user_id for member in created]).update(project_count=F('project_count') + 1)
+            if created:
+                Project.objects.filter(pk=project.pk).update(updated_at=timezone.now())
+        invalidate_project_visibility(*[member.user_id for member in created])
+        return created, errors
+    
+    def remove_members(self, project):
+        """Remove the given users from the project, reporting ids that were not members"""
+        user_ids = self.get_user_ids()
+        memberships = ProjectMember.objects.filter(project=project, user_id__in=user_ids)
+        removed = set(memberships.values_list('user_id', flat=True))
+        memberships.delete()
+        errors = [
+            {'user_id': user_id, 'error': "User is not a member of this project."}
+            for user_id in user_ids if user_id not in removed
+        ]
+        return [user_id for user_id in user_ids if user_id in removed], errors
 
 class ProjectMemberListSerializer(serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
-    current_project_count = serializers.SerializerMethodField()
+    project = serializers.PrimaryKeyRelatedField(read_only=True)
+    current_project_count = serializers.IntegerField(source='user.project_count', read_only=True)
     
     class Meta:
         model = ProjectMember
-        fields = ('id', 'user', 'joined_at', 'current_project_count')
-    
-    def get_current_project_count(self, obj):
-        """Get the number of projects the user is currently assigned to"""
-        return ProjectMember.objects.filter(user=obj.user).count()
+        fields = ('id', 'user', 'project', 'joined_at', 'current_project_count')
 
 class ProjectSerializer(serializers.ModelSerializer):
     owner = serializers.PrimaryKeyRelatedField(read_only=True)
@@ -153,13 +179,33 @@ class ProjectSerializer(serializers.ModelSerializer):
         model = Project
         fields = '__all__'
     
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """Prefetch members and annotate member counts for list responses"""
+        other_members = ProjectMember.objects.filter(
+            project=OuterRef('pk')
+        ).exclude(
+            user=OuterRef('owner')
+        ).order_by().values('project').annotate(count=Count('pk')).values('count')
+        return queryset.prefetch_related(
+            Prefetch('projectmembership', queryset=ProjectMember.objects.select_related('user').order_by('id'))
+        ).annotate(
+            annotated_member_count=Coalesce(Subquery(other_members), 0) + 1
+        )
+    
     def get_members(self, obj):
         """Get project members (excluding owner)"""
-        members = ProjectMember.objects.filter(project=obj)
+        if 'projectmembership' in getattr(obj, '_prefetched_objects_cache', {}):
+            members = obj.projectmembership.all()
+        else:
+            members = ProjectMember.objects.filter(project=obj).select_related('user').order_by('id')
         return UserSerializer([member.user for member in members], many=True).data
     
     def get_member_count(self, obj):
         """Get total number of project members (including owner)"""
+        annotated_count = getattr(obj, 'annotated_member_count', None)
+        if annotated_count is not None:
+            return annotated_count
         return obj.members.count()
     
     def __init__(self, *args, **kwargs):
@@ -170,8 +216,36 @@ class ProjectSerializer(serializers.ModelSerializer):
                 if field_name in self.fields:
                     self.fields[field_name].required = False
 
+class ProjectStatsSerializer(serializers.ModelSerializer):
+    project_id = serializers.IntegerField(read_only=True)
+    progress_percent = serializers.FloatField(read_only=True)
+    total_hours = serializers.DecimalField(max_digits=12, decimal_places=2, coerce_to_string=False, read_only=True)
+    task_count = serializers.IntegerField(read_only=True)
+    
+    class Meta:
+        model = ProjectStats
+        fields = ('project_id', 'progress_percent', 'total_hours', 'task_count', 'done_count', 'milestone_count')
+
+class PrefetchedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that looks objects up in `context['related_objects'][field_name]`
+    when a bulk view has loaded them already, instead of running a query per value.
+    """
+    def to_internal_value(self, data):
+        objects = self.context.get('related_objects', {}).get(self.field_name)
+        if objects is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return objects[int(data)]
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+
 class MilestoneSerializer(serializers.ModelSerializer):
-    project = serializers.PrimaryKeyRelatedField(queryset=Project.objects.all())
+    project = PrefetchedPrimaryKeyRelatedField(queryset=Project.objects.all())
     
     class Meta:
         model = Milestone
@@ -186,12 +260,14 @@ class MilestoneSerializer(serializers.ModelSerializer):
                     self.fields[field_name].required = False
 
 class TaskSerializer(serializers.ModelSerializer):
-    assignee = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), allow_null=True, required=False)
-    milestone = serializers.PrimaryKeyRelatedField(queryset=Milestone.objects.all())
+    assignee = PrefetchedPrimaryKeyRelatedField(queryset=User.objects.all(), allow_null=True, required=False)
+    milestone = PrefetchedPrimaryKeyRelatedField(queryset=Milestone.objects.all())
     
     class Meta:
         model = Task
         fields = '__all__'
+        # Only the time ledger (Task.log_time) changes logged hours
+        read_only_fields = ('logged_hours',)
     
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -200,6 +276,161 @@ class TaskSerializer(serializers.ModelSerializer):
             for field_name in ['title', 'description', 'status', 'priority', 'assignee', 'milestone']:
                 if field_name in self.fields:
                     self.fields[field_name].required = False
+    
+    def update(self, instance, validated_data):
+        # Write only the submitted columns, so a concurrent log_time() increment isn't overwritten
+        for field, value in validated_data.items():
+            setattr(instance, field, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+class LogTimeSerializer(serializers.Serializer):
+    hours = serializers.DecimalField(max_digits=5, decimal_places=2, min_value=Decimal('0.01'))
+
+def collect_ids(items, key):
+    """Integer ids found under `key` in a list of dicts; malformed values are left to field validation"""
+    ids = set()
+    for item in items:
+        try:
+            ids.add(int(item[key]))
+        except (KeyError, TypeError, ValueError):
+            pass
+    return ids
+
+def can_change_task(user, task):
+    """Same rule as IsTaskAssigneeOrManagerOrAdmin"""
+    return user.is_admin or user.is_manager or task.assignee_id == user.pk
+
+class TaskBulkSerializer(serializers.Serializer):
+    """Create (POST) or partially update (PATCH) many tasks: {"tasks": [{...}, ...]}"""
+    tasks = serializers.ListField(
+        child=serializers.DictField(), allow_empty=False, max_length=settings.TASK_BULK_MAX_ITEMS
+    )
+    
+    def get_task_context(self, items):
+        """Serializer context with every assignee and milestone the items reference, one query each"""
+        return {
+            **self.context,
+            'related_objects': {
+                'assignee': User.objects.in_bulk(collect_ids(items, 'assignee')),
+                'milestone': Milestone.objects.in_bulk(collect_ids(items, 'milestone')),
+            }
+        }
+    
+    def create_tasks(self):
+        """Validate every item and insert the valid ones in one transaction"""
+        items = self.validated_data['tasks']
+        context = self.get_task_context(items)
+        tasks = []
+        errors = []
+        for index, item in enumerate(items):
+            serializer = TaskSerializer(data=item, context=context)
+            if serializer.is_valid():
+                tasks.append(Task(**serializer.validated_data))
+            else:
+                errors.append({'index': index, 'errors': serializer.errors})
+        with transaction.atomic():
+            created = Task.objects.bulk_create(tasks)
+            # bulk_create skips the post_save handlers that maintain the rollups and search index
+            if created:
+                ProjectStats.apply_task_changes((None, task.get_project_rollup_state()) for task in created)
+                SearchEntry.index_tasks(created)
+        return created, errors
+    
+    def update_tasks(self):
+        """Apply partial updates to every task the user may change, in one transaction"""
+        user = self.context['request'].user
+        items = self.validated_data['tasks']
+        context = self.get_task_context(items)
+        updated = {}
+        changes = []
+        fields = set()
+        errors = []
+        with transaction.atomic():
+            # Locked until commit, so the rollup deltas start from the stored values
+            tasks = Task.objects.select_related('milestone').select_for_update(of=('self',)).in_bulk(collect_ids(items, 'id'))
+            for index, item in enumerate(items):
+                task_id = item.get('id')
+                task = tasks.get(task_id) if isinstance(task_id, int) else None
+                if task is None:
+                    errors.append({'index': index, 'id': task_id, 'errors': {'id': ['Task does not exist.']}})
+                    continue
+                if task_id in updated:
+                    errors.append({'index': index, 'id': task_id, 'errors': {'id': ['Task appears more than once.']}})
+                    continue
+                if not can_change_task(user, task):
+                    errors.append({'index': index, 'id': task_id, 'errors': {'id': ['You do not have permission to change this task.']}})
+                    continue
+                serializer = TaskSerializer(task, data={k: v for k, v in item.items() if k != 'id'}, partial=True, context=context)
+                if not serializer.is_valid():
+                    errors.append({'index': index, 'id': task_id, 'errors': serializer.errors})
+                    continue
+                # Rollups of both the old and the new project change when a task moves
+                old_state = task.get_project_rollup_state()
+                for field, value in serializer.validated_data.items():
+                    setattr(task, field, value)
+                changes.append((old_state, task.get_project_rollup_state()))
+                fields.update(serializer.validated_data)
+                updated[task_id] = task
+            now = timezone.now()
+            for task in updated.values():
+                task.updated_at = now
+            if fields:
+                Task.objects.bulk_update(updated.values(), [*fields, 'updated_at'])
+            # bulk_update skips the post_save handlers that maintain the rollups and search index
+            if fields & {'milestone', 'status'}:
+                ProjectStats.apply_task_changes(changes)
+            if fields & {'milestone', 'title', 'description'}:
+                SearchEntry.index_tasks(list(updated.values()))
+        return list(updated.values()), errors
+
+class TaskStatusBulkSerializer(serializers.Serializer):
+    """Move many tasks to one status: {"task_ids": [...], "status": "done"}"""
+    task_ids = serializers.ListField(
+        child=serializers.IntegerField(), allow_empty=False, max_length=settings.TASK_BULK_MAX_ITEMS
+    )
+    status = serializers.ChoiceField(choices=Task.STATUS_CHOICES)
+    
+    def change_status(self):
+        """Set the status on every task the user may change with a single UPDATE"""
+        user = self.context['request'].user
+        task_ids = list(dict.fromkeys(self.validated_data['task_ids']))
+        new_status = self.validated_data['status']
+        allowed = []
+        errors = []
+        with transaction.atomic():
+            # Locked until commit, so the rollup deltas start from the stored statuses
+            tasks = Task.objects.select_related('milestone').select_for_update(of=('self',)).in_bulk(task_ids)
+            for task_id in task_ids:
+                task = tasks.get(task_id)
+                if task is None:
+                    errors.append({'id': task_id, 'error': "Task does not exist."})
+                elif not can_change_task(user, task):
+                    errors.append({'id': task_id, 'error': "You do not have permission to change this task."})
+                else:
+                    allowed.append(task)
+            Task.objects.filter(pk__in=[task.pk for task in allowed]).update(status=new_status, updated_at=timezone.now())
+            ProjectStats.apply_task_changes(
+                (task.get_project_rollup_state(), (task.milestone.project_id, new_status, task.logged_hours))
+                for task in allowed
+            )
+        return [task.pk for task in allowed], errors
+
+class SearchResultSerializer(serializers.ModelSerializer):
+    type = serializers.CharField(source='kind')
+    id = serializers.IntegerField(source='object_id')
+    rank = serializers.FloatField()
+    
+    class Meta:
+        model = SearchEntry
+        fields = ('type', 'id', 'project', 'task', 'title', 'body', 'rank')
+        read_only_fields = fields
+
+class TimeEntrySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = TimeEntry
+        fields = ('id', 'task', 'user', 'hours', 'logged_at')
+        read_only_fields = fields
 
 class CommentSerializer(serializers.ModelSerializer):
     user = serializers.PrimaryKeyRelatedField(queryset=User.objects.all())
@@ -0,0 +1,212 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+from .models import Attachment, Comment, Milestone, Project, ProjectMember, ProjectStats, SearchEntry, Task, Tombstone, User
+from .authentication import invalidate_cached_user
+from .serializers import UserSerializer
+from .visibility import invalidate_project_visibility
+
+
+def _project_id_for_milestone(milestone_id, task=None):
+    """Resolve a milestone's project, using the task's cached milestone when possible"""
+    if milestone_id is None:
+        return None
+    if task is not None and Task.milestone.is_cached(task) and task.milestone.pk == milestone_id:
+        return task.milestone.project_id
+    return Milestone.objects.filter(pk=milestone_id).values_list('project_id', flat=True).first()
+
+
+def _task_deltas(state, sign):
+    milestone_id, status, hours = state
+    deltas = {'total_hours': sign * (hours or 0)}
+    if status in ProjectStats.STATUS_FIELDS:
+        deltas[ProjectStats.STATUS_FIELDS[status]] = sign
+    return deltas
+
+
+# Project stats rollup
+@receiver(post_save, sender=Project)
+def create_project_stats(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        ProjectStats.objects.get_or_create(project=instance)
+
+
+@receiver(post_save, sender=Task)
+def update_stats_on_task_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    new_state = instance.get_rollup_state()
+    old_state = getattr(instance, '_rollup_state', None)
+    if created:
+        ProjectStats.apply_delta(_project_id_for_milestone(instance.milestone_id, instance), **_task_deltas(new_state, 1))
+    elif old_state is None:
+        # Loaded without the rolled-up fields; recompute the project instead of guessing
+        ProjectStats.rebuild([_project_id_for_milestone(instance.milestone_id, instance)])
+    elif old_state != new_state:
+        new_project_id = _project_id_for_milestone(instance.milestone_id, instance)
+        old_project_id = new_project_id if old_state[0] == new_state[0] else _project_id_for_milestone(old_state[0])
+        ProjectStats.apply_delta(old_project_id, **_task_deltas(old_state, -1))
+        ProjectStats.apply_delta(new_project_id, **_task_deltas(new_state, 1))
+    instance._rollup_state = new_state
+
+
+@receiver(post_delete, sender=Task)
+def update_stats_on_task_delete(sender, instance, **kwargs):
+    state = getattr(instance, '_rollup_state', None) or instance.get_rollup_state()
+    ProjectStats.apply_delta(_project_id_for_milestone(state[0], instance), **_task_deltas(state, -1))
+
+
+@receiver(post_save, sender=Milestone)
+def update_stats_on_milestone_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old_project_id = getattr(instance, '_loaded_project_id', None)
+    if created:
+        ProjectStats.apply_delta(instance.project_id, milestone_count=1)
+    elif old_project_id != instance.project_id:
+        # Moving a milestone moves its tasks too
+        ProjectStats.rebuild([project_id for project_id in (old_project_id, instance.project_id) if project_id])
+    instance._loaded_project_id = instance.project_id
+
+
+@receiver(post_delete, sender=Milestone)
+def update_stats_on_milestone_delete(sender, instance, **kwargs):
+    ProjectStats.apply_delta(instance.project_id, milestone_count=-1)
+
+
+# Cached project visibility
+@receiver(post_save, sender=User)
+def reset_visibility_for_new_user(sender, instance, created, **kwargs):
+    if created:
+        invalidate_project_visibility(instance.pk)
+
+
+@receiver(post_save, sender=Project)
+def reset_visibility_on_project_save(sender, instance, created, **kwargs):
+    old_owner_id = getattr(instance, '_loaded_owner_id', None)
+    if created or old_owner_id != instance.owner_id:
+        invalidate_project_visibility(old_owner_id, instance.owner_id)
+    instance._loaded_owner_id = instance.owner_id
+
+
+@receiver(post_delete, sender=Project)
+def reset_visibility_on_project_delete(sender, instance, **kwargs):
+    # Memberships are cascaded and handled by their own post_delete
+    invalidate_project_visibility(instance.owner_id)
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def reset_visibility_on_membership_change(sender, instance, **kwargs):
+    invalidate_project_visibility(instance.user_id)
+
+
+# Cached JWT users
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def reset_cached_user(sender, instance, **kwargs):
+    invalidate_cached_user(instance.pk)
+
+
+# Per-user membership counter (incremented by ProjectMember.save and the bulk endpoint)
+@receiver(post_delete, sender=ProjectMember)
+def count_removed_membership(sender, instance, **kwargs):
+    User.objects.filter(pk=instance.user_id, project_count__gt=0).update(project_count=F('project_count') - 1)
+
+
+# Search index
+@receiver(post_save, sender=Project)
+def index_project(sender, instance, raw=False, **kwargs):
+    if not raw:
+        SearchEntry.upsert([SearchEntry.for_project(instance)])
+
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    SearchEntry.upsert([SearchEntry.for_task(instance, _project_id_for_milestone(instance.milestone_id, instance))])
+    if not created:
+        # The task may have moved to another project's milestone
+        SearchEntry.sync_comment_projects(SearchEntry.objects.filter(task=instance))
+
+
+@receiver(post_save, sender=Milestone)
+def reindex_milestone_tasks(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        SearchEntry.objects.filter(task__milestone=instance).exclude(project_id=instance.project_id).update(project_id=instance.project_id)
+
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, raw=False, **kwargs):
+    if not raw:
+        project_id = Task.objects.filter(pk=instance.task_id).values_list('milestone__project_id', flat=True).first()
+        SearchEntry.upsert([SearchEntry.for_comment(instance, project_id)])
+
+
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, **kwargs):
+    # Task and project rows go with their FK cascades
+    SearchEntry.objects.filter(kind='comment', object_id=instance.pk).delete()
+
+
+# Delta sync: tombstones for deletes, and membership changes count as project changes
+@receiver(post_delete, sender=Project)
+def tombstone_project(sender, instance, **kwargs):
+    Tombstone.objects.create(kind='project', object_id=instance.pk, project_id=instance.pk)
+
+
+@receiver(post_delete, sender=Milestone)
+def tombstone_milestone(sender, instance, **kwargs):
+    Tombstone.objects.create(kind='milestone', object_id=instance.pk, project_id=instance.project_id)
+
+
+@receiver(post_delete, sender=Task)
+def tombstone_task(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        kind='task',
+        object_id=instance.pk,
+        project_id=_project_id_for_milestone(instance.milestone_id, instance),
+        assignee_id=instance.assignee_id
+    )
+
+
+@receiver(post_delete, sender=Comment)
+@receiver(post_delete, sender=Attachment)
+def tombstone_task_child(sender, instance, **kwargs):
+    project_id, assignee_id = Task.objects.filter(pk=instance.task_id).values_list(
+        'milestone__project_id', 'assignee_id'
+    ).first() or (None, None)
+    Tombstone.objects.create(
+        kind=sender._meta.model_name,
+        object_id=instance.pk,
+        project_id=project_id,
+        assignee_id=assignee_id
+    )
+
+
+@receiver(post_delete, sender=ProjectMember)
+def tombstone_membership(sender, instance, **kwargs):
+    # Tells the removed member to drop the project's rows; the ones they still see are re-sent
+    Tombstone.objects.create(
+        kind='membership',
+        object_id=instance.project_id,
+        project_id=instance.project_id,
+        assignee_id=instance.user_id
+    )
+
+
+@receiver(post_save, sender=ProjectMember)
+@receiver(post_delete, sender=ProjectMember)
+def touch_project_on_membership_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        Project.objects.filter(pk=instance.project_id).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=User)
+def touch_projects_on_member_change(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    # Project responses embed their members' user fields, so those edits are project changes
+    if created or raw or (update_fields is not None and not set(update_fields) & set(UserSerializer.Meta.fields)):
+        return
+    Project.objects.filter(projectmembership__user=instance).update(updated_at=timezone.now())
\ No newline at end of file
@@ -1,8 +1,49 @@
+import csv
+import json
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from importlib import import_module
+from io import BytesIO, StringIO
+from pathlib import Path
+from zoneinfo import ZoneInfo
+from django.apps import apps as django_apps
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.core.management.base import CommandError, SystemCheckError
 from django.urls import reverse
-from rest_framework.test import APITestCase
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.translation import gettext_lazy
+from rest_framework.test import APIClient, APIRequestFactory, APITestCase
+from rest_framework.exceptions import AuthenticationFailed, ErrorDetail, ParseError
+from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status
-from .models import User, Project, Milestone, Task, Comment, Attachment
+from rest_framework.renderers import JSONRenderer
+from rest_framework.serializers import BaseSerializer
+from .models import (
+    MAX_LOGGED_HOURS, MAX_PROJECTS_PER_USER, User, Project, Milestone, Task, Comment, Attachment, ProjectMember,
+    ProjectStats, TimeEntry, SearchEntry, Tombstone,
+)
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import IntegrityError, connection, transaction
+from django.db.models import FloatField, Value
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from unittest import mock, skipUnless
+from .authentication import CachedJWTAuthentication
+from .filters import TaskFilter
+from .pagination import KeysetPagination
+from .parsers import FastJSONParser, MessagePackParser
+from .renderers import CSVRenderer, FastJSONRenderer, MessagePackRenderer, NDJSONRenderer, msgpack
+from . import serializers as serializers_module
+from .serializers import CommentSerializer, MilestoneSerializer, ProjectSerializer, TaskSerializer
+from .values import ValuesSerializer
+from .visibility import get_project_visibility
 
 class APITests(APITestCase):
     def setUp(self):
@@ -101,12 +142,12 @@ class APITests(APITestCase):
         # Filter by status
         response = self.client.get(url + '?status=todo')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['status'], 'todo')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['status'], 'todo')
         # Filter by assignee
         response = self.client.get(url + f'?assignee={self.user.id}')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertTrue(all(task['assignee'] == self.user.id for task in response.data))
+        self.assertTrue(all(task['assignee'] == self.user.id for task in response.data['results']))
 
     def test_project_crud(self):
         url = reverse('project-list-create')
@@ -187,3 +228,1659 @@ class APITests(APITestCase):
         url_detail = reverse('attachment-detail', args=[attachment_id])
         response = self.client.get(url_detail)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ProjectListQueryCountTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='Admin@1234', role='admin')
+        self.client.force_authenticate(user=self.admin)
+
+    def create_projects(self, count):
+        for index in range(count):
+            project = Project.objects.create(name=f'Project {index}', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.admin)
+            for member_index in range(2):
+                member = User.objects.create_user(username=f'member_{index}_{member_index}', password='Member@1234')
+                ProjectMember.objects.create(project=project, user=member)
+
+    def count_list_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project-list-create'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries), response
+
+    def test_project_list_query_count_is_constant(self):
+        self.create_projects(2)
+        small_count, _ = self.count_list_queries()
+        for index in range(2, 12):
+            project = Project.objects.create(name=f'Project {index}', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.admin)
+            member = User.objects.create_user(username=f'extra_member_{index}', password='Member@1234')
+            ProjectMember.objects.create(project=project, user=member)
+        large_count, _ = self.count_list_queries()
+        self.assertEqual(small_count, large_count)
+
+    def test_project_list_member_fields(self):
+        self.create_projects(1)
+        _, response = self.count_list_queries()
+        project_data = response.data['results'][0]
+        self.assertEqual(project_data['member_count'], 3)
+        self.assertEqual(len(project_data['members']), 2)
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username='admin', password='Admin@1234', role='admin')
+        self.client.force_authenticate(user=self.admin)
+        project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.admin)
+        milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=project)
+        self.tasks = [
+            Task.objects.create(title=f'Task {index}', milestone=milestone)
+            for index in range(5)
+        ]
+
+    def test_cursor_walks_every_row_once(self):
+        url = reverse('task-list-create') + '?page_size=2'
+        seen = []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data['results']), 2)
+            seen.extend(task['id'] for task in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, sorted((task.id for task in self.tasks), reverse=True))
+
+    def test_page_size_is_capped(self):
+        with mock.patch.object(KeysetPagination, 'max_page_size', 3):
+            response = self.client.get(reverse('task-list-create') + '?page_size=1000')
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNotNone(response.data['next'])
+
+
+class ProjectStatsTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+
+    def assertStatsConsistent(self, project):
+        stored = ProjectStats.objects.get(pk=project.pk)
+        computed = ProjectStats.compute([project.pk])[project.pk]
+        for field in ['total_hours', 'milestone_count', 'todo_count', 'in_progress_count', 'done_count']:
+            self.assertEqual(getattr(stored, field), getattr(computed, field), field)
+        return stored
+
+    def test_stats_follow_task_writes(self):
+        task = Task.objects.create(title='Task1', milestone=self.milestone, logged_hours=2)
+        Task.objects.create(title='Task2', status='done', milestone=self.milestone, logged_hours=3)
+        stats = self.assertStatsConsistent(self.project)
+        self.assertEqual(stats.total_hours, Decimal('5'))
+        self.assertEqual(stats.progress_percent, 50.0)
+
+        task = Task.objects.get(pk=task.pk)
+        task.status = 'in_progress'
+        task.logged_hours = Decimal('4.5')
+        task.save()
+        self.assertStatsConsistent(self.project)
+
+        other_project = Project.objects.create(name='Other', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        other_milestone = Milestone.objects.create(title='MS2', due_date='2025-08-01', project=other_project)
+        task.milestone = other_milestone
+        task.save()
+        self.assertStatsConsistent(self.project)
+        self.assertEqual(self.assertStatsConsistent(other_project).in_progress_count, 1)
+
+        task.delete()
+        self.assertEqual(self.assertStatsConsistent(other_project).total_hours, Decimal('0'))
+        other_milestone.delete()
+        self.assertEqual(self.assertStatsConsistent(other_project).milestone_count, 0)
+
+    def test_hours_and_progress_are_single_lookups(self):
+        Task.objects.create(title='Task1', milestone=self.milestone, logged_hours=2)
+        Task.objects.create(title='Task2', status='done', milestone=self.milestone, logged_hours=3)
+        with CaptureQueriesContext(connection) as queries:
+            hours = self.client.get(reverse('project-hours', args=[self.project.id]))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(hours.data['total_hours'], Decimal('5'))
+        with CaptureQueriesContext(connection) as queries:
+            progress = self.client.get(reverse('project-progress', args=[self.project.id]))
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(progress.data['progress_percent'], 50.0)
+        self.assertEqual(self.client.get(reverse('project-progress', args=[0])).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_rebuild_command_repairs_drift(self):
+        Task.objects.create(title='Task1', milestone=self.milestone, logged_hours=2)
+        ProjectStats.objects.filter(pk=self.project.pk).update(total_hours=99, done_count=7)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_project_stats', '--verify', stdout=StringIO())
+        call_command('rebuild_project_stats', stdout=StringIO())
+        call_command('rebuild_project_stats', '--verify', stdout=StringIO())
+        self.assertEqual(self.assertStatsConsistent(self.project).total_hours, Decimal('2'))
+
+
+class ProjectStatsBatchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.other_user = User.objects.create_user(username='otheruser', password='Other@1234')
+        self.client.force_authenticate(user=self.user)
+        self.owned = self.create_project('Owned', self.user, statuses=['done', 'todo'])
+        self.joined = self.create_project('Joined', self.other_user, statuses=['done'])
+        ProjectMember.objects.create(project=self.joined, user=self.user)
+        self.hidden = self.create_project('Hidden', self.other_user, statuses=['todo'])
+
+    def create_project(self, name, owner, statuses):
+        project = Project.objects.create(name=name, description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=owner)
+        milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=project)
+        for task_status in statuses:
+            Task.objects.create(title='Task', status=task_status, milestone=milestone, logged_hours=2)
+        return project
+
+    @override_settings(PROJECT_VISIBILITY_CACHE_TTL=300)
+    def test_batch_returns_visible_projects_only(self):
+        self.client.get(reverse('project-stats-batch'))  # warm the visibility cache
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('project-stats-batch'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(queries), 1)
+        results = {row['project_id']: row for row in response.data['results']}
+        self.assertEqual(set(results), {self.owned.id, self.joined.id})
+        self.assertEqual(results[self.owned.id]['progress_percent'], 50.0)
+        self.assertEqual(results[self.owned.id]['total_hours'], Decimal('4'))
+        self.assertEqual(results[self.joined.id]['progress_percent'], 100.0)
+
+    def test_batch_filters_by_ids_and_rebuilds_missing_rows(self):
+        ProjectStats.objects.filter(pk=self.owned.pk).delete()
+        response = self.client.get(reverse('project-stats-batch') + f'?ids={self.owned.id},{self.hidden.id}')
+        self.assertEqual([row['project_id'] for row in response.data['results']], [self.owned.id])
+        self.assertEqual(response.data['results'][0]['total_hours'], Decimal('4'))
+        self.assertTrue(ProjectStats.objects.filter(pk=self.owned.pk).exists())
+        response = self.client.get(reverse('project-stats-batch') + '?ids=abc')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TimeEntryTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.other_user = User.objects.create_user(username='otheruser', password='Other@1234')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.task = Task.objects.create(title='Task', milestone=milestone, logged_hours=1)
+
+    def test_log_time_appends_to_ledger(self):
+        url = reverse('log-time', args=[self.task.id])
+        response = self.client.post(url, {'hours': '2.5'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['logged_hours'], Decimal('3.5'))
+        self.client.force_authenticate(user=self.other_user)
+        self.client.post(url, {'hours': '1.25'})
+
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.logged_hours, Decimal('4.75'))
+        self.assertEqual(TimeEntry.objects.filter(task=self.task).count(), 2)
+        self.assertEqual(ProjectStats.objects.get(pk=self.project.pk).total_hours, Decimal('4.75'))
+        self.assertEqual(self.client.post(url, {'hours': '-1'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.post(url, {'hours': 'abc'}).status_code, status.HTTP_400_BAD_REQUEST)
+        # Below a hundredth of an hour or beyond DecimalField(max_digits=5, decimal_places=2)
+        for hours in ('0.001', '0', '1000', 'NaN'):
+            self.assertEqual(self.client.post(url, {'hours': hours}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(TimeEntry.objects.filter(task=self.task).count(), 2)
+
+    def test_log_time_stops_at_the_task_total_limit(self):
+        url = reverse('log-time', args=[self.task.id])
+        self.task.log_time(self.user, Decimal('995.25'))
+        response = self.client.post(url, {'hours': '5'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('hours', response.data)
+        self.assertEqual(self.client.post(url, {'hours': '3.74'}).status_code, status.HTTP_200_OK)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.logged_hours, MAX_LOGGED_HOURS)
+        self.assertEqual(TimeEntry.objects.filter(task=self.task).count(), 2)
+        self.assertEqual(ProjectStats.objects.get(pk=self.project.pk).total_hours, MAX_LOGGED_HOURS)
+
+    def test_task_update_does_not_overwrite_logged_time(self):
+        stale = Task.objects.get(pk=self.task.pk)
+        self.task.log_time(self.user, Decimal('5'))
+        serializer = TaskSerializer(stale, data={'title': 'Renamed', 'logged_hours': '0'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        self.task.refresh_from_db()
+        self.assertEqual((self.task.title, self.task.logged_hours), ('Renamed', Decimal('6')))
+        self.assertEqual(ProjectStats.objects.get(pk=self.project.pk).total_hours, Decimal('6'))
+        self.assertEqual(ProjectStats.compute([self.project.pk])[self.project.pk].total_hours, Decimal('6'))
+
+        self.client.force_authenticate(user=User.objects.create_user(username='manager', password='Manager@1234', role='manager'))
+        response = self.client.patch(reverse('task-detail', args=[self.task.id]), {'logged_hours': '0'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['logged_hours'], '6.00')
+
+    def test_timesheet_filters_by_user_and_date_range(self):
+        old_entry = self.task.log_time(self.user, Decimal('1'))
+        TimeEntry.objects.filter(pk=old_entry.pk).update(logged_at=timezone.now() - timedelta(days=10))
+        recent_entry = self.task.log_time(self.user, Decimal('2'))
+        self.task.log_time(self.other_user, Decimal('3'))
+
+        url = reverse('time-entry-list')
+        response = self.client.get(url)
+        self.assertEqual({entry['id'] for entry in response.data['results']}, {old_entry.id, recent_entry.id})
+
+        start = (timezone.now() - timedelta(days=1)).date().isoformat()
+        response = self.client.get(url + f'?start={start}&end={timezone.now().date().isoformat()}')
+        self.assertEqual([entry['id'] for entry in response.data['results']], [recent_entry.id])
+        self.assertEqual(self.client.get(url + '?start=yesterday').status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class VisibilityQuerySetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.other_user = User.objects.create_user(username='otheruser', password='Other@1234')
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.owned = Project.objects.create(name='Owned', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.joined = Project.objects.create(name='Joined', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.other_user)
+        self.hidden = Project.objects.create(name='Hidden', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.other_user)
+        ProjectMember.objects.create(project=self.joined, user=self.user)
+        ProjectMember.objects.create(project=self.joined, user=User.objects.create_user(username='third', password='Third@1234'))
+        self.tasks = {}
+        for project in (self.owned, self.joined, self.hidden):
+            milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=project)
+            self.tasks[project.name] = Task.objects.create(title=project.name, milestone=milestone)
+        self.assigned = Task.objects.create(title='Assigned', milestone=self.tasks['Hidden'].milestone, assignee=self.user)
+        for task in Task.objects.all():
+            Comment.objects.create(task=task, user=self.other_user, content=task.title)
+
+    def test_users_see_owned_joined_and_assigned_rows(self):
+        self.assertEqual(set(Project.objects.visible_to(self.user)), {self.owned, self.joined})
+        self.assertEqual(Milestone.objects.visible_to(self.user).count(), 2)
+        expected_tasks = {self.tasks['Owned'], self.tasks['Joined'], self.assigned}
+        self.assertEqual(set(Task.objects.visible_to(self.user)), expected_tasks)
+        self.assertEqual({comment.task for comment in Comment.objects.visible_to(self.user)}, expected_tasks)
+        self.assertEqual(Task.objects.visible_to(self.manager).count(), Task.objects.count())
+
+    def test_visibility_filter_does_not_use_distinct(self):
+        sql = str(Task.objects.visible_to(self.user).query).upper()
+        self.assertIn('EXISTS', sql)
+        self.assertNotIn('DISTINCT', sql)
+
+
+@override_settings(PROJECT_VISIBILITY_CACHE_TTL=300)
+class ProjectVisibilityCacheTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.other_user = User.objects.create_user(username='otheruser', password='Other@1234')
+        self.client.force_authenticate(user=self.user)
+        self.owned = Project.objects.create(name='Owned', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.other = Project.objects.create(name='Other', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.other_user)
+
+    def test_visibility_is_cached_across_calls(self):
+        self.assertEqual(get_project_visibility(self.user).visible_ids, {self.owned.id})
+        with self.assertNumQueries(0):
+            self.assertEqual(get_project_visibility(self.user).owned_ids, {self.owned.id})
+
+    def test_membership_and_owner_changes_invalidate(self):
+        get_project_visibility(self.user)
+        membership = ProjectMember.objects.create(project=self.other, user=self.user)
+        self.assertEqual(get_project_visibility(self.user).member_ids, {self.other.id})
+        membership.delete()
+        self.assertEqual(get_project_visibility(self.user).member_ids, set())
+
+        get_project_visibility(self.other_user)
+        self.other.owner = self.user
+        self.other.save()
+        self.assertEqual(get_project_visibility(self.user).owned_ids, {self.owned.id, self.other.id})
+        self.assertEqual(get_project_visibility(self.other_user).owned_ids, set())
+
+    def test_member_permission_reads_cached_visibility(self):
+        milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.other)
+        task = Task.objects.create(title='Task', milestone=milestone)
+        attachment = Attachment.objects.create(task=task, file='attachments/example.txt')
+        url = reverse('attachment-detail', args=[attachment.id])
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_403_FORBIDDEN)
+        ProjectMember.objects.create(project=self.other, user=self.user)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_200_OK)
+
+    @override_settings(PROJECT_VISIBILITY_CACHE_TTL=0)
+    def test_cache_is_off_without_a_shared_backend(self):
+        # Another worker's stale entry, which this process's invalidation could not reach
+        cache.set(f'project-visibility:{self.user.pk}', ([self.owned.id], [self.other.id]), 300)
+        with self.assertNumQueries(2):
+            self.assertEqual(get_project_visibility(self.user).visible_ids, {self.owned.id})
+        self.assertFalse(settings.SHARED_CACHE)
+
+
+class CachedJWTAuthenticationTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+        self.authentication = CachedJWTAuthentication()
+
+    def authenticate(self):
+        request = APIRequestFactory().get('/api/me/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        return self.authentication.authenticate(request)[0]
+
+    def test_user_is_resolved_from_cache(self):
+        self.assertEqual(self.authenticate(), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.authenticate(), self.user)
+
+    def test_save_and_delete_invalidate_cached_user(self):
+        self.authenticate()
+        self.user.role = 'manager'
+        self.user.save()
+        self.assertEqual(self.authenticate().role, 'manager')
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+        self.user.delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+
+@override_settings(MIDDLEWARE=settings.LEAN_MIDDLEWARE)
+class LeanApiProfileTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.token = str(RefreshToken.for_user(self.user).access_token)
+
+    def test_api_requests_skip_browser_middleware(self):
+        response = self.client.get(reverse('user-detail'), HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(hasattr(response.wsgi_request, 'session'))
+        self.assertNotIn('X-Frame-Options', response)
+
+    def test_browser_pages_keep_browser_middleware(self):
+        response = self.client.get('/admin/login/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(hasattr(response.wsgi_request, 'session'))
+        self.assertIn('X-Frame-Options', response)
+        self.assertIn('csrftoken', response.cookies)
+
+    def test_system_checks_pass(self):
+        with override_settings(SILENCED_SYSTEM_CHECKS=[]):
+            with self.assertRaises(SystemCheckError):
+                call_command('check', stdout=StringIO(), stderr=StringIO())
+        with override_settings(SILENCED_SYSTEM_CHECKS=settings.LEAN_SILENCED_SYSTEM_CHECKS):
+            call_command('check', stdout=StringIO(), stderr=StringIO())
+
+
+class ProjectMemberBulkTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=self.manager)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.url = reverse('project-members-bulk', args=[self.project.id])
+
+    def create_users(self, count, prefix='member'):
+        return [User.objects.create_user(username=f'{prefix}_{index}', password='Member@1234') for index in range(count)]
+
+    def test_bulk_add_reports_per_user_errors(self):
+        valid = self.create_users(2)
+        busy = User.objects.create_user(username='busy', password='Busy@1234')
+        for index in range(2):
+            other = Project.objects.create(name=f'Other {index}', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+            ProjectMember.objects.create(project=other, user=busy)
+        existing = User.objects.create_user(username='existing', password='Existing@1234')
+        ProjectMember.objects.create(project=self.project, user=existing)
+        other_manager = User.objects.create_user(username='manager2', password='Manager@1234', role='manager')
+
+        user_ids = [valid[0].id, valid[1].id, valid[0].id, busy.id, existing.id, other_manager.id, 0]
+        response = self.client.post(self.url, {'user_ids': user_ids}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([member['user']['id'] for member in response.data['added']], [valid[0].id, valid[1].id])
+        self.assertEqual([error['user_id'] for error in response.data['errors']], [busy.id, existing.id, other_manager.id, 0])
+        self.assertEqual(ProjectMember.objects.filter(project=self.project).count(), 3)
+
+    def test_bulk_add_query_count_does_not_grow(self):
+        small = self.create_users(2, 'small')
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.post(self.url, {'user_ids': [user.id for user in small]}, format='json')
+        large = self.create_users(20, 'large')
+        with CaptureQueriesContext(connection) as large_queries:
+            self.client.post(self.url, {'user_ids': [user.id for user in large]}, format='json')
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertEqual(ProjectMember.objects.filter(project=self.project).count(), 22)
+
+    def test_bulk_remove(self):
+        members = self.create_users(3)
+        for member in members[:2]:
+            ProjectMember.objects.create(project=self.project, user=member)
+        response = self.client.delete(self.url, {'user_ids': [member.id for member in members]}, format='json')
+        self.assertEqual(response.data['removed'], [members[0].id, members[1].id])
+        self.assertEqual(response.data['errors'][0]['user_id'], members[2].id)
+        self.assertFalse(ProjectMember.objects.filter(project=self.project).exists())
+
+
+class AvailableUsersTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=self.manager)
+        self.owner = User.objects.create_user(username='owner', password='Owner@1234')
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.owner)
+        self.url = reverse('available-users', args=[self.project.id])
+
+    def create_project(self, name):
+        return Project.objects.create(name=name, description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+
+    def test_membership_counter_is_maintained(self):
+        user = User.objects.create_user(username='alice', password='Alice@1234')
+        membership = ProjectMember.objects.create(project=self.project, user=user)
+        ProjectMember.objects.create(project=self.create_project('Other'), user=user)
+        user.refresh_from_db()
+        self.assertEqual(user.project_count, 2)
+        membership.delete()
+        user.refresh_from_db()
+        self.assertEqual(user.project_count, 1)
+
+    def test_excludes_members_capped_users_owner_and_other_roles(self):
+        available = User.objects.create_user(username='alice', password='Alice@1234')
+        member = User.objects.create_user(username='bob', password='Bob@1234')
+        ProjectMember.objects.create(project=self.project, user=member)
+        capped = User.objects.create_user(username='carol', password='Carol@1234')
+        for name in ('Other 1', 'Other 2'):
+            ProjectMember.objects.create(project=self.create_project(name), user=capped)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([user['id'] for user in response.data['results']], [available.id])
+
+    def test_prefix_search_and_username_pagination(self):
+        for username in ('jane', 'john', 'Johanna', 'mike'):
+            User.objects.create_user(username=username, email=f'{username.lower()}@example.com', password='Some@1234')
+        response = self.client.get(self.url + '?search=JO&page_size=1')
+        self.assertEqual([user['username'] for user in response.data['results']], ['Johanna'])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([user['username'] for user in response.data['results']], ['john'])
+        self.assertIsNone(response.data['next'])
+        response = self.client.get(self.url + '?search=mike@')
+        self.assertEqual([user['username'] for user in response.data['results']], ['mike'])
+
+
+class ProjectMemberListQueryBudgetTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=self.manager)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.other_project = Project.objects.create(name='Other', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.url = reverse('project-members', args=[self.project.id])
+
+    def add_members(self, count, prefix):
+        for index in range(count):
+            user = User.objects.create_user(username=f'{prefix}_{index}', password='Member@1234')
+            ProjectMember.objects.create(project=self.project, user=user)
+            if index % 2:
+                ProjectMember.objects.create(project=self.other_project, user=user)
+
+    def test_member_list_uses_fixed_queries(self):
+        self.add_members(2, 'small')
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.get(self.url)
+        self.add_members(30, 'large')
+        with CaptureQueriesContext(connection) as large_queries:
+            response = self.client.get(self.url)
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertLessEqual(len(large_queries), 2)
+        counts = {member['user']['username']: member['current_project_count'] for member in response.data}
+        self.assertEqual(counts['large_0'], 1)
+        self.assertEqual(counts['large_1'], 2)
+        self.assertEqual(response.data[0]['project'], self.project.id)
+
+
+class ProjectMemberCapTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=self.manager)
+        self.projects = [
+            Project.objects.create(name=f'Project {index}', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+            for index in range(3)
+        ]
+        self.user = User.objects.create_user(username='member', password='Member@1234')
+
+    def add(self, project, user_id):
+        return self.client.post(reverse('project-members', args=[project.id]), {'user_id': user_id}, format='json')
+
+    def test_memberships_over_the_cap_block_the_migration_until_trimmed(self):
+        # Rows the old unlocked checks could leave behind; bulk_create skips the counter
+        ProjectMember.objects.bulk_create(ProjectMember(project=project, user=self.user) for project in self.projects)
+        migration = import_module('core.migrations.0008_user_project_count_check')
+        with self.assertRaisesMessage(CommandError, f'user {self.user.id} in project {self.projects[2].id}'):
+            migration.check_memberships_within_cap(django_apps, None)
+        self.assertEqual(ProjectMember.objects.filter(user=self.user).count(), len(self.projects))
+
+        output = StringIO()
+        with self.assertRaises(CommandError):
+            call_command('trim_project_memberships', stdout=output)
+        self.assertIn(f'user {self.user.id} in project {self.projects[2].id}', output.getvalue())
+        self.assertEqual(ProjectMember.objects.filter(user=self.user).count(), len(self.projects))
+
+        call_command('trim_project_memberships', '--remove', stdout=StringIO())
+        self.assertEqual(
+            list(ProjectMember.objects.filter(user=self.user).order_by('pk').values_list('project_id', flat=True)),
+            [self.projects[0].id, self.projects[1].id]
+        )
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.project_count, 2)
+        migration.check_memberships_within_cap(django_apps, None)
+
+    def test_add_member_has_no_pre_count_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.add(self.projects[0], self.user.id)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse([query for query in queries if 'COUNT(' in query['sql'].upper()])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.project_count, 1)
+
+    def test_add_member_rejections(self):
+        self.add(self.projects[0], self.user.id)
+        self.add(self.projects[1], self.user.id)
+        cases = [
+            (self.projects[2], self.user.id, 'Maximum allowed is 2'),
+            (self.projects[0], self.manager.id, 'Project owner'),
+            (self.projects[0], 0, 'does not exist'),
+        ]
+        for project, user_id, message in cases:
+            response = self.add(project, user_id)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn(message, response.data['non_field_errors'][0])
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.project_count, 2)
+
+    def test_duplicate_member_rolls_back_counter(self):
+        other = User.objects.create_user(username='other', password='Other@1234')
+        self.add(self.projects[0], other.id)
+        response = self.add(self.projects[0], other.id)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('already a member', response.data['non_field_errors'][0])
+        other.refresh_from_db()
+        self.assertEqual(other.project_count, 1)
+
+    def test_database_rejects_counter_above_cap(self):
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            User.objects.filter(pk=self.user.pk).update(project_count=3)
+
+
+class ProjectMemberCapConcurrencyTests(TransactionTestCase):
+    def test_concurrent_adds_never_exceed_cap(self):
+        manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        user = User.objects.create_user(username='member', password='Member@1234')
+        projects = [
+            Project.objects.create(name=f'Project {index}', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=manager)
+            for index in range(6)
+        ]
+        barrier = threading.Barrier(len(projects))
+        statuses = []
+
+        def add(project):
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(user=manager)
+            barrier.wait()
+            try:
+                # SQLite may answer a contended write with "table is locked" (a 500); retry
+                # those so every request ends up either added or rejected by the cap
+                for _ in range(20):
+                    response = client.post(reverse('project-members', args=[project.id]), {'user_id': user.id}, format='json')
+                    if response.status_code != status.HTTP_500_INTERNAL_SERVER_ERROR:
+                        break
+                    time.sleep(0.05)
+                statuses.append(response.status_code)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=add, args=(project,)) for project in projects]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(statuses.count(status.HTTP_201_CREATED), MAX_PROJECTS_PER_USER)
+        self.assertEqual(statuses.count(status.HTTP_400_BAD_REQUEST), len(projects) - MAX_PROJECTS_PER_USER)
+        user.refresh_from_db()
+        self.assertEqual(ProjectMember.objects.filter(user=user).count(), MAX_PROJECTS_PER_USER)
+        self.assertEqual(user.project_count, MAX_PROJECTS_PER_USER)
+
+
+class TaskBulkTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.user = User.objects.create_user(username='member', password='Member@1234')
+        self.client.force_authenticate(user=self.manager)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.other_project = Project.objects.create(name='Other', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.other_milestone = Milestone.objects.create(title='Other MS', due_date='2025-08-01', project=self.other_project)
+        self.url = reverse('task-bulk')
+
+    def assertStatsConsistent(self, *projects):
+        for project in projects:
+            stored = ProjectStats.objects.get(pk=project.pk)
+            computed = ProjectStats.compute([project.pk])[project.pk]
+            for field in ['todo_count', 'in_progress_count', 'done_count', 'total_hours']:
+                self.assertEqual(getattr(stored, field), getattr(computed, field), field)
+
+    def create_tasks(self, count, **fields):
+        return [Task.objects.create(title=f'Task {index}', milestone=self.milestone, **fields) for index in range(count)]
+
+    def test_bulk_create_reports_per_item_errors(self):
+        items = [
+            {'title': 'One', 'milestone': self.milestone.id, 'assignee': self.user.id},
+            {'title': 'Two', 'milestone': 0},
+            {'title': 'Three', 'milestone': self.other_milestone.id, 'status': 'done'},
+            {'milestone': self.milestone.id, 'assignee': 'x'},
+        ]
+        response = self.client.post(self.url, {'tasks': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([task['title'] for task in response.data['created']], ['One', 'Three'])
+        self.assertEqual(response.data['created'][0]['assignee'], self.user.id)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1, 3])
+        self.assertIn('milestone', response.data['errors'][0]['errors'])
+        self.assertEqual(set(response.data['errors'][1]['errors']), {'title', 'assignee'})
+        self.assertStatsConsistent(self.project, self.other_project)
+
+    def test_bulk_create_query_count_does_not_grow(self):
+        def post(count):
+            items = [{'title': f'T{index}', 'milestone': self.milestone.id, 'assignee': self.user.id} for index in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, {'tasks': items}, format='json')
+            self.assertEqual(len(response.data['created']), count)
+            return len(queries)
+
+        self.assertEqual(post(2), post(40))
+        self.assertEqual(Task.objects.count(), 42)
+
+    def test_bulk_update_moves_tasks_and_updates_stats(self):
+        tasks = self.create_tasks(3)
+        items = [
+            {'id': tasks[0].id, 'milestone': self.other_milestone.id, 'status': 'done'},
+            {'id': tasks[1].id, 'priority': 'high', 'assignee': self.user.id},
+            {'id': tasks[1].id, 'priority': 'low'},
+            {'id': 0, 'title': 'Missing'},
+            {'id': tasks[2].id, 'status': 'blocked'},
+        ]
+        response = self.client.patch(self.url, {'tasks': items}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([task['id'] for task in response.data['updated']], [tasks[0].id, tasks[1].id])
+        self.assertEqual([error['index'] for error in response.data['errors']], [2, 3, 4])
+        tasks[0].refresh_from_db()
+        tasks[1].refresh_from_db()
+        self.assertEqual((tasks[0].milestone_id, tasks[0].status), (self.other_milestone.id, 'done'))
+        self.assertEqual((tasks[1].priority, tasks[1].assignee_id), ('high', self.user.id))
+        self.assertStatsConsistent(self.project, self.other_project)
+
+    def test_bulk_update_checks_task_permission(self):
+        own, foreign = self.create_tasks(2)
+        own.assignee = self.user
+        own.save()
+        self.client.force_authenticate(user=self.user)
+        items = [{'id': own.id, 'title': 'Mine'}, {'id': foreign.id, 'title': 'Not mine'}]
+        response = self.client.patch(self.url, {'tasks': items}, format='json')
+        self.assertEqual([task['id'] for task in response.data['updated']], [own.id])
+        self.assertEqual(response.data['errors'][0]['id'], foreign.id)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.title, 'Task 1')
+
+    def test_bulk_status_change(self):
+        tasks = self.create_tasks(3)
+        response = self.client.post(
+            reverse('task-bulk-status'),
+            {'task_ids': [tasks[0].id, tasks[1].id, tasks[0].id, 0], 'status': 'in_progress'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], [tasks[0].id, tasks[1].id])
+        self.assertEqual(response.data['errors'], [{'id': 0, 'error': 'Task does not exist.'}])
+        self.assertEqual(Task.objects.filter(status='in_progress').count(), 2)
+        self.assertStatsConsistent(self.project)
+
+        response = self.client.post(reverse('task-bulk-status'), {'task_ids': [tasks[2].id], 'status': 'blocked'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_writes_apply_stats_deltas(self):
+        tasks = self.create_tasks(2, logged_hours=Decimal('1.5'))
+        # Stands in for a log_time increment committed while the bulk request ran: deltas keep
+        # it, where re-aggregating the project and storing the result would overwrite it
+        ProjectStats.apply_delta(self.project.pk, total_hours=Decimal('5'))
+        requests = [
+            (self.client.post, reverse('task-bulk-status'), {'task_ids': [tasks[0].id], 'status': 'done'}),
+            (self.client.patch, self.url, {'tasks': [{'id': tasks[1].id, 'milestone': self.other_milestone.id}]}),
+            (self.client.post, self.url, {'tasks': [{'title': 'New', 'milestone': self.milestone.id}]}),
+        ]
+        for method, url, data in requests:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertIn(method(url, data, format='json').status_code, (status.HTTP_200_OK, status.HTTP_201_CREATED))
+            self.assertFalse([query for query in queries if 'SUM(' in query['sql'].upper()])
+        stats = ProjectStats.objects.get(pk=self.project.pk)
+        self.assertEqual((stats.total_hours, stats.todo_count, stats.done_count), (Decimal('6.5'), 1, 1))
+        stats = ProjectStats.objects.get(pk=self.other_project.pk)
+        self.assertEqual((stats.total_hours, stats.todo_count), (Decimal('1.5'), 1))
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.owner = User.objects.create_user(username='owner', password='Owner@1234')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Apollo launch', description='Rocket project', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.hidden = Project.objects.create(name='Hidden rocket', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.owner)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.hidden_milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.hidden)
+        self.url = reverse('search')
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(result['type'], result['id']) for result in response.data['results']]
+
+    def test_search_ranks_title_matches_first(self):
+        body_match = Task.objects.create(title='Fuel check', description='Inspect the rocket engines', milestone=self.milestone)
+        title_match = Task.objects.create(title='Rocket engines', description='desc', milestone=self.milestone)
+        comment = Comment.objects.create(task=body_match, user=self.user, content='Engines look good')
+        results = self.search(q='engines')
+        self.assertEqual(results[0], ('task', title_match.id))
+        self.assertEqual(set(results), {('task', title_match.id), ('task', body_match.id), ('comment', comment.id)})
+        self.assertEqual(self.search(q='engines', type='comment'), [('comment', comment.id)])
+        self.assertEqual(self.search(q='engine -"'), self.search(q='engines'))
+
+    def test_search_applies_visibility(self):
+        hidden_task = Task.objects.create(title='Rocket secret', milestone=self.hidden_milestone)
+        self.assertEqual(self.search(q='rocket'), [('project', self.project.id)])
+
+        hidden_task.assignee = self.user
+        hidden_task.save()
+        self.assertIn(('task', hidden_task.id), self.search(q='rocket'))
+
+        manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=manager)
+        self.assertIn(('project', self.hidden.id), self.search(q='rocket'))
+
+    def test_index_follows_writes(self):
+        task = Task.objects.create(title='Telemetry', milestone=self.milestone)
+        comment = Comment.objects.create(task=task, user=self.user, content='Telemetry dashboards')
+        task.title = 'Navigation'
+        task.save()
+        self.assertEqual(self.search(q='telemetry'), [('comment', comment.id)])
+        self.assertEqual(self.search(q='navigation'), [('task', task.id)])
+
+        # Moving the milestone to a hidden project hides its task and comments
+        self.milestone.project = self.hidden
+        self.milestone.save()
+        self.assertEqual(self.search(q='telemetry navigation'), [])
+        self.assertEqual(SearchEntry.objects.filter(project=self.hidden).count(), 3)
+
+        comment.delete()
+        task.delete()
+        self.assertFalse(SearchEntry.objects.filter(kind__in=['task', 'comment']).exists())
+
+    def test_bulk_task_writes_are_indexed(self):
+        manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=manager)
+        response = self.client.post(reverse('task-bulk'), {'tasks': [{'title': 'Payload fairing', 'milestone': self.milestone.id}]}, format='json')
+        task_id = response.data['created'][0]['id']
+        self.assertEqual(self.search(q='fairing'), [('task', task_id)])
+        self.client.patch(reverse('task-bulk'), {'tasks': [{'id': task_id, 'title': 'Payload adapter'}]}, format='json')
+        self.assertEqual(self.search(q='fairing'), [])
+        self.assertEqual(self.search(q='adapter'), [('task', task_id)])
+
+    def test_rebuild_matches_incremental_index(self):
+        task = Task.objects.create(title='Booster', description='Stage one', milestone=self.milestone)
+        Comment.objects.create(task=task, user=self.user, content='Booster note')
+        before = set(SearchEntry.objects.values_list('kind', 'object_id', 'project_id', 'task_id', 'title', 'body'))
+        call_command('rebuild_search_index', stdout=StringIO())
+        after = set(SearchEntry.objects.values_list('kind', 'object_id', 'project_id', 'task_id', 'title', 'body'))
+        self.assertEqual(before, after)
+        self.assertEqual(self.search(q='booster'), [('task', task.id), ('comment', task.comments.get().id)])
+
+    def test_search_requires_query_and_known_types(self):
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.client.get(self.url, {'q': 'x', 'type': 'user'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.search(q='"*'), [])
+
+
+class TaskFilterTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.user = User.objects.create_user(username='member', password='Member@1234')
+        self.client.force_authenticate(user=self.manager)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.other_project = Project.objects.create(name='Other', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.early = Milestone.objects.create(title='Early', due_date='2025-08-01', project=self.project)
+        self.late = Milestone.objects.create(title='Late', due_date='2025-09-01', project=self.other_project)
+        self.tasks = {
+            'a': Task.objects.create(title='A', status='todo', priority='high', assignee=self.user, milestone=self.early),
+            'b': Task.objects.create(title='B', status='done', priority='low', assignee=self.user, milestone=self.late),
+            'c': Task.objects.create(title='C', status='todo', priority='low', milestone=self.late),
+        }
+        self.url = reverse('task-list-create')
+
+    def titles(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [task['title'] for task in response.data['results']]
+
+    def test_filters(self):
+        self.assertEqual(self.titles(status='todo'), ['C', 'A'])
+        self.assertEqual(self.titles(priority='low', status='todo'), ['C'])
+        self.assertEqual(self.titles(assignee=self.user.id, status='done'), ['B'])
+        self.assertEqual(self.titles(milestone=self.early.id), ['A'])
+        self.assertEqual(self.titles(project=self.other_project.id), ['C', 'B'])
+        self.assertEqual(self.titles(due_after='2025-08-15'), ['C', 'B'])
+        self.assertEqual(self.titles(due_before='2025-08-15', status='todo'), ['A'])
+        self.assertEqual(self.client.get(self.url, {'status': 'blocked'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ordering(self):
+        self.assertEqual(self.titles(ordering='title'), ['A', 'B', 'C'])
+        self.assertEqual(self.titles(ordering='-title', status='todo'), ['C', 'A'])
+
+    def test_ordering_on_a_shared_value_seeks_on_value_and_id(self):
+        # More rows sharing one status than CursorPagination.offset_cutoff
+        Task.objects.bulk_create(
+            Task(title=f'T{index}', status='todo', priority='low', milestone=self.early) for index in range(1100)
+        )
+        for ordering in ('status', '-priority'):
+            tiebreaker = '-id' if ordering.startswith('-') else 'id'
+            expected = list(Task.objects.order_by(ordering, tiebreaker).values_list('id', flat=True))
+            pages = [self.client.get(self.url, {'ordering': ordering, 'page_size': 200})]
+            with CaptureQueriesContext(connection) as queries:
+                while pages[-1].data['next']:
+                    pages.append(self.client.get(pages[-1].data['next']))
+            ids = [task['id'] for page in pages for task in page.data['results']]
+            self.assertEqual(ids, expected)
+            self.assertFalse([query for query in queries if 'OFFSET' in query['sql'].upper()])
+            # Previous links seek backwards from the first row of the page
+            previous = self.client.get(pages[2].data['previous'])
+            self.assertEqual(previous.data['results'], pages[1].data['results'])
+
+    @skipUnless(connection.vendor == 'sqlite', 'reads the SQLite query plan')
+    def test_filter_combinations_use_indexes(self):
+        combinations = [
+            {'status': 'todo'},
+            {'priority': 'high'},
+            {'status': 'todo', 'priority': 'high'},
+            {'assignee': self.user.id},
+            {'assignee': self.user.id, 'status': 'todo'},
+            {'milestone': self.early.id},
+            {'milestone': self.early.id, 'status': 'done'},
+            {'project': self.project.id},
+            {'project': self.project.id, 'status': 'todo'},
+            {'due_after': '2025-08-01', 'due_before': '2025-09-01'},
+            {'project': self.project.id, 'due_before': '2025-09-01'},
+            {'priority': 'high', 'due_after': '2025-08-01'},
+        ]
+        for params in combinations:
+            queryset = TaskFilter(params, queryset=Task.objects.all()).qs.order_by('-id')[:50]
+            sql, sql_params = queryset.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', sql_params)
+                plan = [row[3] for row in cursor.fetchall()]
+            with self.subTest(params=params):
+                self.assertFalse([step for step in plan if step.startswith('SCAN')], plan)
+
+
+class ProjectBoardTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.url = reverse('project-board', args=[self.project.id])
+
+    def create_tasks(self, count, task_status):
+        return [Task.objects.create(title=f'{task_status} {index}', status=task_status, milestone=self.milestone) for index in range(count)]
+
+    def column(self, response, task_status):
+        return next(column for column in response.data['columns'] if column['status'] == task_status)
+
+    def test_board_groups_tasks_with_independent_cursors(self):
+        todo = self.create_tasks(5, 'todo')
+        done = self.create_tasks(2, 'done')
+        response = self.client.get(self.url, {'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([column['status'] for column in response.data['columns']], ['todo', 'in_progress', 'done'])
+        todo_column = self.column(response, 'todo')
+        self.assertEqual(todo_column['count'], 5)
+        self.assertEqual([task['id'] for task in todo_column['results']], [todo[4].id, todo[3].id])
+        self.assertEqual(self.column(response, 'in_progress')['results'], [])
+        done_column = self.column(response, 'done')
+        self.assertEqual([task['id'] for task in done_column['results']], [done[1].id, done[0].id])
+        self.assertIsNone(done_column['next'])
+
+        # Paging the todo column leaves the other columns on their first page
+        response = self.client.get(todo_column['next'])
+        self.assertEqual([task['id'] for task in self.column(response, 'todo')['results']], [todo[2].id, todo[1].id])
+        self.assertEqual([task['id'] for task in self.column(response, 'done')['results']], [done[1].id, done[0].id])
+        response = self.client.get(self.column(response, 'todo')['next'] + '&status=todo')
+        self.assertEqual([column['status'] for column in response.data['columns']], ['todo'])
+        self.assertEqual([task['id'] for task in response.data['columns'][0]['results']], [todo[0].id])
+        self.assertIsNone(response.data['columns'][0]['next'])
+
+    @override_settings(PROJECT_VISIBILITY_CACHE_TTL=300)
+    def test_board_query_count_is_constant(self):
+        self.create_tasks(2, 'todo')
+        # Warm the visibility cache so both requests see the same cache state
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.get(self.url)
+        for task_status in ('todo', 'in_progress', 'done'):
+            self.create_tasks(30, task_status)
+        with CaptureQueriesContext(connection) as large_queries:
+            response = self.client.get(self.url)
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertLessEqual(len(large_queries), 2)
+        self.assertEqual(self.column(response, 'todo')['count'], 32)
+
+    def test_board_requires_project_access(self):
+        other = User.objects.create_user(username='other', password='Other@1234')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(reverse('project-board', args=[0])).status_code, status.HTTP_404_NOT_FOUND)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.client.get(self.url, {'cursor_todo': 'bogus'}).status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(self.url, {'status': 'blocked'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+
+@override_settings(SYNC_WATERMARK_LAG_SECONDS=0)
+class SyncTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.owner = User.objects.create_user(username='owner', password='Owner@1234')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.task = Task.objects.create(title='Task', milestone=self.milestone)
+        self.other_task = Task.objects.create(title='Other task', milestone=self.milestone)
+        self.comment = Comment.objects.create(task=self.task, user=self.user, content='Hello')
+        self.hidden = Project.objects.create(name='Hidden', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.owner)
+        self.hidden_milestone = Milestone.objects.create(title='Hidden MS', due_date='2025-08-01', project=self.hidden)
+        self.url = reverse('sync')
+
+    def sync(self, since=None):
+        response = self.client.get(self.url, {'since': since} if since else {})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def ids(self, data, key):
+        return [row['id'] for row in data[key]]
+
+    def test_full_sync_returns_visible_rows(self):
+        data = self.sync()
+        self.assertTrue(data['full'])
+        self.assertEqual(self.ids(data, 'projects'), [self.project.id])
+        self.assertEqual(self.ids(data, 'milestones'), [self.milestone.id])
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.id, self.other_task.id])
+        self.assertEqual(self.ids(data, 'comments'), [self.comment.id])
+        self.assertEqual(data['deleted'], [])
+        self.assertIsNone(data['next'])
+
+    def sync_pages(self, since=None):
+        pages = [self.sync(since)]
+        while pages[-1]['next']:
+            response = self.client.get(pages[-1]['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            pages.append(response.data)
+        return pages
+
+    def test_sync_is_paged_across_tables(self):
+        keys = ('deleted', 'projects', 'milestones', 'tasks', 'comments', 'attachments')
+        expected = self.sync()
+        with override_settings(SYNC_PAGE_SIZE=2):
+            pages = self.sync_pages()
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(len({page['watermark'] for page in pages}), 1)
+        for key in keys:
+            self.assertEqual([row for page in pages for row in page[key]], expected[key])
+
+        self.comment.delete()
+        self.other_task.delete()
+        Milestone.objects.create(title='MS2', due_date='2025-08-02', project=self.project)
+        since = pages[0]['watermark']
+        expected = self.sync(since)
+        with override_settings(SYNC_PAGE_SIZE=1):
+            pages = self.sync_pages(since)
+        # Deletes come first, so they are applied before rows of later pages
+        self.assertEqual([page['deleted'] for page in pages[:3]], [[expected['deleted'][0]], [expected['deleted'][1]], []])
+        for key in keys:
+            self.assertEqual([row for page in pages for row in page[key]], expected[key])
+
+        self.assertEqual(self.client.get(self.url, {'cursor': 'garbage'}).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_delta_returns_only_changes_since_watermark(self):
+        watermark = self.sync()['watermark']
+        data = self.sync(watermark)
+        self.assertEqual([data[key] for key in ('projects', 'milestones', 'tasks', 'comments', 'attachments', 'deleted')], [[]] * 6)
+
+        self.task.title = 'Renamed'
+        self.task.save()
+        self.other_task.log_time(self.user, Decimal('1.5'))
+        new_milestone = Milestone.objects.create(title='MS2', due_date='2025-08-02', project=self.project)
+        comment_id = self.comment.id
+        self.comment.delete()
+        hidden_task = Task.objects.create(title='Hidden', milestone=self.hidden_milestone)
+        hidden_task.delete()
+
+        data = self.sync(watermark)
+        self.assertFalse(data['full'])
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.id, self.other_task.id])
+        self.assertEqual(self.ids(data, 'milestones'), [new_milestone.id])
+        self.assertEqual(data['comments'], [])
+        self.assertEqual(data['deleted'], [{'type': 'comment', 'id': comment_id}])
+        self.assertEqual(self.sync(data['watermark'])['tasks'], [])
+
+    def test_bulk_writes_and_membership_changes_are_synced(self):
+        watermark = self.sync()['watermark']
+        manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=manager)
+        self.client.post(reverse('task-bulk-status'), {'task_ids': [self.task.id], 'status': 'done'}, format='json')
+        self.client.patch(reverse('task-bulk'), {'tasks': [{'id': self.other_task.id, 'priority': 'high'}]}, format='json')
+        self.client.post(reverse('project-members-bulk', args=[self.hidden.id]), {'user_ids': [self.user.id]}, format='json')
+
+        self.client.force_authenticate(user=self.user)
+        data = self.sync(watermark)
+        self.assertEqual(self.ids(data, 'tasks'), [self.task.id, self.other_task.id])
+        # Joining a project brings in its existing rows
+        self.assertEqual(self.ids(data, 'projects'), [self.hidden.id])
+        self.assertEqual(self.ids(data, 'milestones'), [self.hidden_milestone.id])
+
+    @override_settings(SYNC_WATERMARK_LAG_SECONDS=30)
+    def test_watermark_trails_the_clock(self):
+        before = timezone.now()
+        watermark = parse_datetime(self.sync()['watermark'])
+        self.assertLessEqual(watermark, before - timedelta(seconds=29))
+        # A write stamped before that sync but committed after it is still picked up
+        Task.objects.filter(pk=self.task.pk).update(updated_at=before - timedelta(seconds=1))
+        self.assertIn(self.task.id, self.ids(self.sync(watermark.isoformat()), 'tasks'))
+
+    def test_removed_member_is_told_to_drop_the_project(self):
+        membership = ProjectMember.objects.create(project=self.hidden, user=self.user)
+        assigned = Task.objects.create(title='Assigned', milestone=self.hidden_milestone, assignee=self.user)
+        watermark = self.sync()['watermark']
+        membership.delete()
+
+        data = self.sync(watermark)
+        self.assertEqual(data['deleted'], [{'type': 'membership', 'id': self.hidden.id}])
+        # Still visible as the assignee, so sent again after the client drops the project's rows
+        self.assertEqual(self.ids(data, 'tasks'), [assigned.id])
+        self.assertEqual(data['projects'], [])
+        self.assertEqual(data['milestones'], [])
+
+        self.client.force_authenticate(user=self.owner)
+        self.assertEqual(self.sync(watermark)['deleted'], [])
+
+    def test_project_delete_leaves_tombstones(self):
+        watermark = self.sync()['watermark']
+        project_id, task_id, comment_id = self.project.id, self.task.id, self.comment.id
+        self.project.delete()
+        # The user no longer sees the project's rows, only that the project is gone
+        self.assertEqual(self.sync(watermark)['deleted'], [{'type': 'project', 'id': project_id}])
+        manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=manager)
+        deleted = self.sync(watermark)['deleted']
+        self.assertIn({'type': 'task', 'id': task_id}, deleted)
+        self.assertIn({'type': 'comment', 'id': comment_id}, deleted)
+
+    def test_since_validation_and_retention(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'yesterday'}).status_code, status.HTTP_400_BAD_REQUEST)
+        stale = (timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1)).isoformat()
+        self.assertEqual(self.client.get(self.url, {'since': stale}).status_code, status.HTTP_410_GONE)
+
+        self.comment.delete()
+        Tombstone.objects.update(deleted_at=timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS + 1))
+        call_command('purge_tombstones', stdout=StringIO())
+        self.assertFalse(Tombstone.objects.exists())
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.task = Task.objects.create(title='Task', milestone=self.milestone, assignee=self.user)
+
+    def test_detail_returns_304_until_the_row_changes(self):
+        url = reverse('task-detail', args=[self.task.id])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(len(queries), 1)
+
+        self.task.log_time(self.user, Decimal('1'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_detail_checks_permissions_before_304(self):
+        url = reverse('project-detail', args=[self.project.id])
+        etag = self.client.get(url)['ETag']
+        other = User.objects.create_user(username='other', password='Other@1234')
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_list_etag_tracks_changes_and_deletes(self):
+        url = reverse('task-list-create')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertNotEqual(self.client.get(url, {'status': 'done'})['ETag'], etag)
+
+        other = Task.objects.create(title='Other', milestone=self.milestone)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response['ETag']
+
+        # Deleting an older row doesn't move the newest updated_at, but it leaves a tombstone
+        self.task.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+        self.assertNotIn('Last-Modified', self.client.get(url))
+
+    def test_list_validation_does_not_grow_with_the_collection(self):
+        url = reverse('comment-list-create')
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as small_queries:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        Comment.objects.bulk_create(Comment(task=self.task, user=self.user, content=f'Comment {index}') for index in range(50))
+        etag = self.client.get(url)['ETag']
+        with CaptureQueriesContext(connection) as large_queries:
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+        # Comment, Task, Milestone and Project versions, and the newest tombstone
+        self.assertEqual(len(large_queries), len(small_queries))
+        self.assertEqual(len(large_queries), 5)
+
+    def test_project_list_changes_with_membership(self):
+        url = reverse('project-list-create')
+        etag = self.client.get(url)['ETag']
+        ProjectMember.objects.create(project=self.project, user=User.objects.create_user(username='member', password='Member@1234'))
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_200_OK)
+
+    def test_project_etags_change_with_member_user_fields(self):
+        member = User.objects.create_user(username='member', password='Member@1234')
+        ProjectMember.objects.create(project=self.project, user=member)
+        urls = [reverse('project-list-create'), reverse('project-detail', args=[self.project.id])]
+        etags = [self.client.get(url)['ETag'] for url in urls]
+
+        # Fields the project responses don't show leave them cached
+        member.last_login = timezone.now()
+        member.save(update_fields=['last_login'])
+        for url, etag in zip(urls, etags):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        member.email = 'member@example.com'
+        member.save()
+        for url, etag in zip(urls, etags):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertIn('member@example.com', response.content.decode())
+
+
+class ProjectOverviewTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=self.manager)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.url = reverse('project-overview', args=[self.project.id])
+
+    def populate(self, count, prefix):
+        for index in range(count):
+            user = User.objects.create_user(username=f'{prefix}_member_{index}', password='Member@1234')
+            ProjectMember.objects.create(project=self.project, user=user)
+            User.objects.create_user(username=f'{prefix}_free_{index}', password='Free@1234')
+            Milestone.objects.create(title=f'{prefix} {index}', due_date='2025-08-02', project=self.project)
+            Task.objects.create(title=f'{prefix} {index}', milestone=self.milestone, assignee=user, logged_hours=1)
+
+    def test_overview_returns_all_sections(self):
+        self.populate(3, 'small')
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['project']['member_count'], 4)
+        self.assertEqual(response.data['stats']['total_hours'], Decimal('3'))
+        self.assertEqual(len(response.data['members']), 3)
+        self.assertEqual([user['username'] for user in response.data['available_users']['results']], ['small_free_0', 'small_free_1', 'small_free_2'])
+        self.assertEqual(len(response.data['milestones']), 4)
+        self.assertEqual(response.data['tasks']['count'], 3)
+        self.assertIsNone(response.data['tasks']['next'])
+
+    @override_settings(API_PAGE_SIZE=2)
+    def test_overview_pages_link_into_list_endpoints(self):
+        self.populate(3, 'small')
+        response = self.client.get(self.url, {'sections': 'tasks,available_users'})
+        self.assertEqual(set(response.data), {'project_id', 'tasks', 'available_users'})
+        self.assertEqual(len(response.data['tasks']['results']), 2)
+        rest = self.client.get(response.data['tasks']['next'])
+        self.assertEqual(rest.status_code, status.HTTP_200_OK)
+        seen = [task['id'] for task in response.data['tasks']['results'] + rest.data['results']]
+        self.assertEqual(sorted(seen, reverse=True), seen)
+        self.assertEqual(len(set(seen)), 3)
+        rest = self.client.get(response.data['available_users']['next'])
+        self.assertEqual([user['username'] for user in rest.data['results']][:1], ['small_free_2'])
+
+    def test_overview_query_count_is_fixed(self):
+        self.populate(2, 'small')
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as small_queries:
+            self.client.get(self.url)
+        self.populate(8, 'large')
+        with CaptureQueriesContext(connection) as large_queries:
+            self.client.get(self.url)
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertLessEqual(len(large_queries), 6)
+
+    def test_overview_sections_follow_permissions(self):
+        member = User.objects.create_user(username='member', password='Member@1234')
+        ProjectMember.objects.create(project=self.project, user=member)
+        self.client.force_authenticate(user=member)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('members', response.data)
+        self.assertNotIn('available_users', response.data)
+        self.assertEqual(self.client.get(self.url, {'sections': 'members'}).status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(self.client.get(self.url, {'sections': 'bogus'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+        outsider = User.objects.create_user(username='outsider', password='Outsider@1234')
+        self.client.force_authenticate(user=outsider)
+        self.assertEqual(self.client.get(self.url).status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.owner = User.objects.create_user(username='owner', password='Owner@1234')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.hidden = Project.objects.create(name='Hidden', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.owner)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.hidden_milestone = Milestone.objects.create(title='Hidden MS', due_date='2025-08-01', project=self.hidden)
+        self.tasks = [
+            Task.objects.create(title='First, "quoted"', status='todo', milestone=self.milestone),
+            Task.objects.create(title='Second', status='done', milestone=self.milestone),
+        ]
+        self.hidden_task = Task.objects.create(title='Hidden', milestone=self.hidden_milestone)
+
+    def export(self, name, **params):
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_task_export_ndjson(self):
+        response, body = self.export('export-tasks')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row['id'] for row in rows], [task.id for task in self.tasks])
+        self.assertEqual(rows[0]['project'], self.project.id)
+        self.assertEqual(rows[0]['logged_hours'], '0.00')
+        _, body = self.export('export-tasks', status='done')
+        self.assertEqual([json.loads(line)['title'] for line in body.splitlines()], ['Second'])
+
+    def test_task_export_csv(self):
+        response, body = self.export('export-tasks', **{'as': 'csv'})
+        self.assertIn('attachment; filename="tasks.csv"', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(body)))
+        self.assertEqual([row['title'] for row in rows], ['First, "quoted"', 'Second'])
+        self.assertEqual(rows[0]['assignee'], '')
+        self.assertEqual(self.client.get(reverse('export-tasks'), {'as': 'xml'}).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_export_format_follows_accept_header(self):
+        url = reverse('export-tasks')
+        response = self.client.get(url, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('attachment; filename="tasks.csv"', response['Content-Disposition'])
+        rows = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual([row['title'] for row in rows], ['First, "quoted"', 'Second'])
+
+        response = self.client.get(url, HTTP_ACCEPT='application/x-ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        response = self.client.get(url, {'as': 'ndjson'}, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+
+        response = self.client.get(url, {'as': 'xml'}, HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn('as', response.json())
+
+    def test_export_renderers_render_errors_as_json(self):
+        errors = {'as': [ErrorDetail('Unknown export format.', code='invalid')]}
+        for renderer in (NDJSONRenderer(), CSVRenderer()):
+            self.assertEqual(renderer.render(errors, renderer.media_type), FastJSONRenderer().render(errors))
+
+    def test_time_entry_and_comment_exports_follow_visibility(self):
+        self.tasks[0].log_time(self.user, Decimal('2.5'))
+        self.hidden_task.log_time(self.owner, Decimal('1'))
+        Comment.objects.create(task=self.tasks[0], user=self.user, content='Visible')
+        Comment.objects.create(task=self.hidden_task, user=self.owner, content='Hidden')
+
+        _, body = self.export('export-time-entries')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([(row['task'], row['hours']) for row in rows], [(self.tasks[0].id, '2.50')])
+        _, body = self.export('export-comments')
+        self.assertEqual([json.loads(line)['content'] for line in body.splitlines()], ['Visible'])
+
+        manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.client.force_authenticate(user=manager)
+        _, body = self.export('export-comments', task=self.hidden_task.id)
+        self.assertEqual([json.loads(line)['content'] for line in body.splitlines()], ['Hidden'])
+        _, body = self.export('export-time-entries', **{'as': 'csv', 'user': self.owner.id})
+        self.assertEqual(len(list(csv.DictReader(StringIO(body)))), 1)
+
+    def test_export_reads_rows_through_a_chunked_iterator(self):
+        with override_settings(EXPORT_CHUNK_SIZE=1), mock.patch('django.db.models.query.QuerySet.iterator', autospec=True, side_effect=lambda queryset, chunk_size=None: iter(queryset._clone())) as iterator:
+            _, body = self.export('export-tasks')
+        self.assertEqual(iterator.call_args.kwargs, {'chunk_size': 1})
+        self.assertEqual(len(body.splitlines()), 2)
+
+
+class ImportTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.client.force_authenticate(user=self.manager)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+
+    def upload(self, kind, name, content, **params):
+        url = reverse('import', kwargs={'kind': kind})
+        if params:
+            url += '?' + '&'.join(f'{key}={value}' for key, value in params.items())
+        return self.client.post(url, {'file': SimpleUploadedFile(name, content.encode())}, format='multipart')
+
+    def task_csv(self, count):
+        rows = ['title,status,priority,milestone,assignee']
+        rows += [f'Task {n},todo,high,{self.milestone.id},testuser' for n in range(count)]
+        return '\n'.join(rows) + '\n'
+
+    def test_task_csv_import_reports_bad_rows_and_keeps_the_rest(self):
+        content = (
+            'title,description,status,milestone,assignee\n'
+            f'Import me,"with, comma",done,{self.milestone.id},testuser\n'
+            f'Bad status,,someday,{self.milestone.id},\n'
+            'No milestone,,todo,999999,\n'
+            f'Nobody,,todo,{self.milestone.id},ghost\n'
+            f'By id,,todo,{self.milestone.id},{self.user.id}\n'
+        )
+        response = self.upload('tasks', 'tasks.csv', content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([row['line'] for row in response.data['created']], [2, 6])
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 4, 5])
+        self.assertIn('status', response.data['errors'][0]['errors'])
+        self.assertIn('milestone', response.data['errors'][1]['errors'])
+        self.assertIn('assignee', response.data['errors'][2]['errors'])
+
+        task = Task.objects.get(pk=response.data['created'][0]['id'])
+        self.assertEqual((task.description, task.status, task.assignee), ('with, comma', 'done', self.user))
+        self.assertEqual(Task.objects.get(pk=response.data['created'][1]['id']).assignee, self.user)
+        # bulk_create skips the signal handlers, so the rollups and search index are refreshed explicitly
+        stats = ProjectStats.objects.get(pk=self.project.id)
+        self.assertEqual((stats.task_count, stats.done_count), (2, 1))
+        self.assertTrue(SearchEntry.objects.filter(kind='task', object_id=task.id, project=self.project).exists())
+
+    def test_ndjson_project_and_milestone_import(self):
+        content = '\n'.join([
+            json.dumps({'name': 'Mine', 'start_date': '2025-01-01', 'end_date': '2025-02-01'}),
+            json.dumps({'name': 'Theirs', 'start_date': '2025-01-01', 'end_date': '2025-02-01', 'owner': 'testuser'}),
+            '{not json',
+            '[1, 2]',
+            json.dumps({'name': 'Orphan', 'start_date': '2025-01-01', 'end_date': '2025-02-01', 'owner': 'ghost'}),
+        ])
+        response = self.upload('projects', 'projects.ndjson', content)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual([error['line'] for error in response.data['errors']], [3, 4, 5])
+        mine, theirs = (Project.objects.get(pk=row['id']) for row in response.data['created'])
+        self.assertEqual((mine.owner, theirs.owner), (self.manager, self.user))
+        self.assertTrue(ProjectStats.objects.filter(pk=theirs.pk).exists())
+        self.assertTrue(SearchEntry.objects.filter(kind='project', object_id=theirs.pk).exists())
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual([project['id'] for project in self.client.get(reverse('project-list-create')).data['results']], [theirs.pk])
+
+        self.client.force_authenticate(user=self.manager)
+        content = json.dumps({'title': 'Imported', 'due_date': '2025-01-15', 'project': theirs.pk})
+        response = self.upload('milestones', 'milestones.txt', content, **{'as': 'ndjson'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(ProjectStats.objects.get(pk=theirs.pk).milestone_count, 1)
+
+    def test_only_managers_and_admins_can_import(self):
+        response = self.upload('tasks', 'tasks.csv', 'title\n')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.upload('users', 'users.csv', 'username\n').status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.upload('tasks', 'tasks.xml', '', **{'as': 'xml'}).status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.user)
+        self.assertEqual(self.upload('tasks', 'tasks.csv', self.task_csv(1)).status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_references_are_resolved_once_per_batch(self):
+        with CaptureQueriesContext(connection) as small:
+            self.upload('tasks', 'tasks.csv', self.task_csv(2))
+        with CaptureQueriesContext(connection) as large:
+            response = self.upload('tasks', 'tasks.csv', self.task_csv(30))
+        self.assertEqual(len(response.data['created']), 30)
+        self.assertEqual(len(large), len(small))
+        with override_settings(IMPORT_BATCH_SIZE=10), CaptureQueriesContext(connection) as batched:
+            self.upload('tasks', 'tasks.csv', self.task_csv(30))
+        self.assertGreater(len(batched), len(large))
+        self.assertEqual(Task.objects.count(), 62)
+
+    def test_import_records_command(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / 'tasks.csv'
+        path.write_text(self.task_csv(3) + f'Broken,never,high,{self.milestone.id},\n')
+        out, err = StringIO(), StringIO()
+        call_command('import_records', 'tasks', str(path), stdout=out, stderr=err)
+        self.assertIn('Created 3 tasks, skipped 1 invalid row(s)', out.getvalue())
+        self.assertIn('line 5:', err.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('import_records', 'projects', str(path), owner='ghost')
+
+
+class ValuesSerializerTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.milestones = [
+            Milestone.objects.create(title='First', due_date='2025-08-01', project=self.project),
+            Milestone.objects.create(title='Second', due_date='2025-08-15', project=self.project),
+        ]
+        self.tasks = [
+            Task.objects.create(title='Unassigned', milestone=self.milestones[0]),
+            Task.objects.create(title='Assigned', status='done', priority='high', assignee=self.user, milestone=self.milestones[1], description='Text'),
+            Task.objects.create(title='Zeta', milestone=self.milestones[1]),
+        ]
+        self.tasks[1].log_time(self.user, Decimal('1.5'))
+        Comment.objects.create(task=self.tasks[0], user=self.user, content='Hello')
+        Comment.objects.create(task=self.tasks[1], user=self.user, content='Ünïcode ✓')
+
+    def assertParity(self, serializer_class, queryset):
+        values_serializer = ValuesSerializer(serializer_class)
+        expected = JSONRenderer().render(serializer_class(queryset, many=True).data)
+        actual = JSONRenderer().render(values_serializer.serialize(values_serializer.values(queryset)))
+        self.assertEqual(actual, expected)
+
+    def test_matches_model_serializers(self):
+        self.assertParity(TaskSerializer, Task.objects.order_by('id'))
+        self.assertParity(CommentSerializer, Comment.objects.order_by('id'))
+        self.assertParity(MilestoneSerializer, Milestone.objects.order_by('id'))
+
+    def test_list_endpoints_return_the_model_serializer_json(self):
+        cases = [
+            ('task-list-create', TaskSerializer, Task.objects.order_by('-id')),
+            ('milestone-list-create', MilestoneSerializer, Milestone.objects.order_by('-id')),
+            ('comment-list-create', CommentSerializer, Comment.objects.order_by('-id')),
+        ]
+        for name, serializer_class, queryset in cases:
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(
+                JSONRenderer().render(response.data['results']),
+                JSONRenderer().render(serializer_class(queryset, many=True).data)
+            )
+
+    def test_keyset_pages_follow_dict_rows(self):
+        response = self.client.get(reverse('task-list-create'), {'ordering': 'title', 'page_size': 2})
+        titles = [task['title'] for task in response.data['results']]
+        response = self.client.get(response.data['next'])
+        titles += [task['title'] for task in response.data['results']]
+        self.assertEqual(titles, ['Assigned', 'Unassigned', 'Zeta'])
+        self.assertIsNone(response.data['next'])
+
+    def test_rejects_fields_it_cannot_encode(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesSerializer(ProjectSerializer)
+
+
+class FastJSONTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='testuser', password='Test@1234', role='manager')
+        self.client.force_authenticate(user=self.user)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.user)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.task = Task.objects.create(title='Task', milestone=self.milestone, assignee=self.user)
+        self.task.log_time(self.user, Decimal('12.75'))
+        self.comment = Comment.objects.create(task=self.task, user=self.user, content='Line\u2028separator')
+
+    def payload(self):
+        return {
+            'decimal': Decimal('9999999999.99'),
+            'utc': datetime(2025, 8, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            'paris': datetime(2025, 8, 1, 12, 30, 15, 250000, tzinfo=ZoneInfo('Europe/Paris')),
+            'naive': datetime(2025, 8, 1, 12, 30),
+            'date': date(2025, 8, 1),
+            'text': 'Ünïcode ✓ \u2028 \u2029 "quoted"',
+            'lazy': gettext_lazy('This field is required.'),
+            'errors': {'title': [ErrorDetail('Required.', code='required')]},
+            7: 'integer key',
+            'huge': 2 ** 70,
+            'nested': [(1, 2), None, True, 1.5],
+        }
+
+    def test_renders_the_same_bytes_as_the_stdlib_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload()), JSONRenderer().render(self.payload()))
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload(), 'application/json; indent=4'),
+            JSONRenderer().render(self.payload(), 'application/json; indent=4')
+        )
+        self.assertEqual(FastJSONRenderer().render(None), b'')
+        with mock.patch('core.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.payload()), JSONRenderer().render(self.payload()))
+
+    def test_api_values_round_trip_exactly(self):
+        def fetch(name, pk):
+            response = self.client.get(reverse(name, kwargs={'pk': pk}))
+            self.assertIsInstance(response.accepted_renderer, FastJSONRenderer)
+            return FastJSONParser().parse(BytesIO(response.content))
+
+        task = fetch('task-detail', self.task.pk)
+        self.assertEqual(Decimal(task['logged_hours']), Decimal('12.75'))
+        self.assertEqual(parse_datetime(task['updated_at']), Task.objects.get(pk=self.task.pk).updated_at)
+        comment = fetch('comment-detail', self.comment.pk)
+        self.assertEqual(comment['content'], 'Line\u2028separator')
+        self.assertEqual(parse_datetime(comment['timestamp']), self.comment.timestamp)
+        self.assertEqual(parse_datetime(comment['updated_at']), self.comment.updated_at)
+        milestone = MilestoneSerializer(data=fetch('milestone-detail', self.milestone.pk))
+        self.assertTrue(milestone.is_valid(), milestone.errors)
+        self.assertEqual(milestone.validated_data['due_date'], date(2025, 8, 1))
+
+    def test_parser(self):
+        self.assertEqual(FastJSONParser().parse(BytesIO('{"title": "Ünï", "hours": 1.25}'.encode())), {'title': 'Ünï', 'hours': 1.25})
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": NaN}'))
+        latin = BytesIO('{"title": "caf\xe9"}'.encode('latin-1'))
+        self.assertEqual(FastJSONParser().parse(latin, parser_context={'encoding': 'latin-1'}), {'title': 'café'})
+
+        response = self.client.post(reverse('task-list-create'), '{"title": ', content_type='application/json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.patch(
+            reverse('task-detail', kwargs={'pk': self.task.pk}), {'title': 'Line\u2028break'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.task.refresh_from_db()
+        self.assertEqual(self.task.title, 'Line\u2028break')
+
+
+@skipUnless(msgpack, 'msgpack is not installed')
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class MessagePackTests(APITestCase):
+    def setUp(self):
+        self.manager = User.objects.create_user(username='manager', password='Manager@1234', role='manager')
+        self.member = User.objects.create_user(username='member', password='Member@1234')
+        self.client.force_authenticate(user=self.manager)
+        self.project = Project.objects.create(name='Project', description='desc', start_date='2025-07-29', end_date='2025-08-29', owner=self.manager)
+        self.membership = ProjectMember.objects.create(project=self.project, user=self.member)
+        self.milestone = Milestone.objects.create(title='MS', due_date='2025-08-01', project=self.project)
+        self.task = Task.objects.create(title='Task ✓', description='Line two', milestone=self.milestone, assignee=self.member)
+        self.time_entry = self.task.log_time(self.member, Decimal('3.25'))
+        self.comment = Comment.objects.create(task=self.task, user=self.member, content='Comment')
+        self.attachment = Attachment.objects.create(task=self.task, file=SimpleUploadedFile('test_msgpack.txt', b'content'))
+
+    def assertSameStructure(self, msgpack_content, json_content):
+        self.assertEqual(msgpack.unpackb(msgpack_content, raw=False), json.loads(json_content))
+
+    def test_every_serializer_renders_the_json_structure(self):
+        search_result = SearchEntry.objects.filter(kind='task').annotate(rank=Value(0.5, output_field=FloatField())).get()
+        samples = {
+            serializers_module.UserRegistrationSerializer: serializers_module.UserRegistrationSerializer(self.member),
+            serializers_module.UserLoginSerializer: serializers_module.UserLoginSerializer({'username': 'member', 'password': 'secret'}),
+            serializers_module.UserDetailSerializer: serializers_module.UserDetailSerializer(self.member),
+            serializers_module.UserSerializer: serializers_module.UserSerializer(self.member),
+            serializers_module.UserCreateSerializer: serializers_module.UserCreateSerializer(self.member),
+            serializers_module.ProjectMemberSerializer: serializers_module.ProjectMemberSerializer(self.membership),
+            serializers_module.ProjectMemberBulkSerializer: serializers_module.ProjectMemberBulkSerializer({'user_ids': [self.member.pk]}),
+            serializers_module.ProjectMemberListSerializer: serializers_module.ProjectMemberListSerializer(self.membership),
+            serializers_module.ProjectSerializer: serializers_module.ProjectSerializer(self.project),
+            serializers_module.ProjectStatsSerializer: serializers_module.ProjectStatsSerializer(ProjectStats.objects.get(pk=self.project.pk)),
+            serializers_module.MilestoneSerializer: serializers_module.MilestoneSerializer(self.milestone),
+            serializers_module.TaskSerializer: serializers_module.TaskSerializer(self.task),
+            serializers_module.TaskBulkSerializer: serializers_module.TaskBulkSerializer({'tasks': [{'title': 'New', 'milestone': self.milestone.pk}]}),
+            serializers_module.TaskStatusBulkSerializer: serializers_module.TaskStatusBulkSerializer({'task_ids': [self.task.pk], 'status': 'done'}),
+            serializers_module.SearchResultSerializer: serializers_module.SearchResultSerializer(search_result),
+            serializers_module.TimeEntrySerializer: serializers_module.TimeEntrySerializer(self.time_entry),
+            serializers_module.LogTimeSerializer: serializers_module.LogTimeSerializer({'hours': Decimal('1.50')}),
+            serializers_module.CommentSerializer: serializers_module.CommentSerializer(self.comment),
+            serializers_module.AttachmentSerializer: serializers_module.AttachmentSerializer(self.attachment),
+        }
+        defined = {
+            cls for cls in vars(serializers_module).values()
+            if isinstance(cls, type) and issubclass(cls, BaseSerializer) and cls.__module__ == serializers_module.__name__
+        }
+        self.assertEqual(set(samples), defined)
+        for serializer_class, serializer in samples.items():
+            with self.subTest(serializer_class.__name__):
+                self.assertSameStructure(MessagePackRenderer().render(serializer.data), JSONRenderer().render(serializer.data))
+                many = serializer_class([serializer.instance], many=True)
+                self.assertSameStructure(MessagePackRenderer().render(many.data), JSONRenderer().render(many.data))
+        # ProjectStatsSerializer keeps total_hours a Decimal; it becomes a number in both formats
+        self.assertEqual(msgpack.unpackb(MessagePackRenderer().render(samples[serializers_module.ProjectStatsSerializer].data))['total_hours'], 3.25)
+
+    def test_accept_header_selects_msgpack(self):
+        urls = [
+            reverse('task-list-create'), reverse('task-detail', kwargs={'pk': self.task.pk}),
+            reverse('project-list-create'), reverse('project-detail', kwargs={'pk': self.project.pk}),
+        ]
+        for url in urls:
+            with self.subTest(url):
+                response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response['Content-Type'], 'application/msgpack')
+                self.assertSameStructure(response.content, self.client.get(url, HTTP_ACCEPT='application/json').content)
+        self.assertEqual(self.client.get(reverse('task-list-create'), {'format': 'msgpack'})['Content-Type'], 'application/msgpack')
+        self.assertEqual(self.client.get(reverse('task-list-create'))['Content-Type'], 'application/json')
+
+    def test_content_type_selects_msgpack(self):
+        body = msgpack.packb({'title': 'Packed', 'status': 'in_progress', 'milestone': self.milestone.pk, 'assignee': None})
+        response = self.client.post(
+            reverse('task-list-create'), body, content_type='application/msgpack', HTTP_ACCEPT='application/msgpack'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        created = msgpack.unpackb(response.content)
+        self.assertEqual((created['title'], created['status'], created['logged_hours']), ('Packed', 'in_progress', '0.00'))
+        self.assertTrue(Task.objects.filter(pk=created['id'], title='Packed').exists())
+
+        body = msgpack.packb({'name': 'Packed project', 'start_date': '2025-01-01', 'end_date': '2025-02-01'})
+        response = self.client.post(reverse('project-list-create'), body, content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['owner'], self.manager.pk)
+
+        response = self.client.post(reverse('task-list-create'), b'\xc1', content_type='application/msgpack')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(msgpack.packb({'title': 'x'})[:-1]))
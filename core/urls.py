@@ -1,11 +1,14 @@
 from django.urls import path
 from .views import (
     UserRegistrationView, UserLoginView, UserDetailView, UserCreateView,
-    ProjectListCreateView, ProjectDetailView, ProjectMemberListView, ProjectMemberDetailView, AvailableUsersListView,
+    ProjectListCreateView, ProjectDetailView, ProjectMemberListView, ProjectMemberDetailView, ProjectMemberBulkView, AvailableUsersListView,
     MilestoneListCreateView, MilestoneDetailView,
-    TaskListCreateView, TaskDetailView, UserTasksView, LogTimeView, ProjectHoursView, ProjectProgressView,
+    TaskListCreateView, TaskDetailView, TaskBulkView, TaskStatusBulkView, UserTasksView, LogTimeView, ProjectHoursView, ProjectProgressView, ProjectStatsBatchView, ProjectBoardView, ProjectOverviewView,
+    TimeEntryListView,
     CommentListCreateView, CommentDetailView,
-    AttachmentListCreateView, AttachmentDetailView
+    AttachmentListCreateView, AttachmentDetailView,
+    SearchView, SyncView,
+    TaskExportView, TimeEntryExportView, CommentExportView, ImportView
 )
 
 urlpatterns = [
@@ -17,12 +20,16 @@ urlpatterns = [
     
     # Project Management
     path('projects/', ProjectListCreateView.as_view(), name='project-list-create'),
+    path('projects/stats/', ProjectStatsBatchView.as_view(), name='project-stats-batch'),
     path('projects/<int:pk>/', ProjectDetailView.as_view(), name='project-detail'),
     path('projects/<int:pk>/progress/', ProjectProgressView.as_view(), name='project-progress'),
     path('projects/<int:pk>/total_hours/', ProjectHoursView.as_view(), name='project-hours'),
+    path('projects/<int:pk>/board/', ProjectBoardView.as_view(), name='project-board'),
+    path('projects/<int:pk>/overview/', ProjectOverviewView.as_view(), name='project-overview'),
     
     # Project Member Management
     path('projects/<int:project_id>/members/', ProjectMemberListView.as_view(), name='project-members'),
+    path('projects/<int:project_id>/members/bulk/', ProjectMemberBulkView.as_view(), name='project-members-bulk'),
     path('projects/<int:project_id>/members/<int:user_id>/', ProjectMemberDetailView.as_view(), name='project-member-detail'),
     path('projects/<int:project_id>/available-users/', AvailableUsersListView.as_view(), name='available-users'),
     
@@ -32,9 +39,12 @@ urlpatterns = [
     
     # Task Management
     path('tasks/', TaskListCreateView.as_view(), name='task-list-create'),
+    path('tasks/bulk/', TaskBulkView.as_view(), name='task-bulk'),
+    path('tasks/bulk/status/', TaskStatusBulkView.as_view(), name='task-bulk-status'),
     path('user/tasks/', UserTasksView.as_view(), name='user-tasks'),
     path('tasks/<int:pk>/', TaskDetailView.as_view(), name='task-detail'),
     path('tasks/<int:pk>/log_time/', LogTimeView.as_view(), name='log-time'),
+    path('time-entries/', TimeEntryListView.as_view(), name='time-entry-list'),
     
     # Comment Management
     path('comments/', CommentListCreateView.as_view(), name='comment-list-create'),
@@ -43,4 +53,18 @@ urlpatterns = [
     # Attachment Management
     path('attachments/', AttachmentListCreateView.as_view(), name='attachment-list-create'),
     path('attachments/<int:pk>/', AttachmentDetailView.as_view(), name='attachment-detail'),
+    
+    # Search
+    path('search/', SearchView.as_view(), name='search'),
+    
+    # Delta Sync
+    path('sync/', SyncView.as_view(), name='sync'),
+    
+    # Exports
+    path('exports/tasks/', TaskExportView.as_view(), name='export-tasks'),
+    path('exports/time-entries/', TimeEntryExportView.as_view(), name='export-time-entries'),
+    path('exports/comments/', CommentExportView.as_view(), name='export-comments'),
+    
+    # Imports
+    path('imports/<str:kind>/', ImportView.as_view(), name='import'),
 ]
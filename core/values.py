@@ -0,0 +1,77 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+from rest_framework.response import Response
+
+# Fields whose to_representation() returns database values unchanged
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField, serializers.CharField, serializers.ChoiceField,
+    serializers.IntegerField, serializers.PrimaryKeyRelatedField,
+)
+# Fields whose to_representation() only formats the value, so it can be called without an instance
+FORMATTING_FIELDS = (serializers.DateField, serializers.DateTimeField, serializers.DecimalField)
+
+
+class ValuesSerializer:
+    """
+    Read-only twin of a flat ModelSerializer that renders `.values()` rows
+    instead of model instances. The output shape is taken from the
+    serializer's own fields, and each field gets an encoder picked once up
+    front (identity, or the field's to_representation for dates and
+    decimals), so a row costs a dict lookup and at most one call per field.
+    Serializers with fields it cannot reproduce are rejected.
+    """
+    def __init__(self, serializer_class):
+        if serializer_class.to_representation is not serializers.ModelSerializer.to_representation:
+            raise ImproperlyConfigured(f"{serializer_class.__name__} overrides to_representation()")
+        self.columns = []
+        for name, field in serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, PASSTHROUGH_FIELDS):
+                encode = None
+            elif isinstance(field, FORMATTING_FIELDS):
+                encode = field.to_representation
+            else:
+                raise ImproperlyConfigured(
+                    f"{serializer_class.__name__}.{name} ({type(field).__name__}) has no values() encoder"
+                )
+            self.columns.append((name, field.source, encode))
+        self.lookups = list(dict.fromkeys(source for _, source, _ in self.columns))
+
+    def values(self, queryset):
+        """The queryset as dicts of the lookups this serializer reads"""
+        return queryset.values(*self.lookups)
+
+    def to_representation(self, row):
+        data = {}
+        for name, source, encode in self.columns:
+            value = row[source]
+            data[name] = value if encode is None or value is None else encode(value)
+        return data
+
+    def serialize(self, rows):
+        return [self.to_representation(row) for row in rows]
+
+
+class ValuesListMixin:
+    """
+    Serve GET lists from `.values()` through a ValuesSerializer built from the
+    view's serializer_class, skipping model instances and ModelSerializer
+    field walking. Keyset pagination works unchanged on dict rows; the JSON
+    is the same as the regular list.
+    """
+    _values_serializers = {}
+
+    def get_values_serializer(self):
+        serializer_class = self.get_serializer_class()
+        if serializer_class not in self._values_serializers:
+            self._values_serializers[serializer_class] = ValuesSerializer(serializer_class)
+        return self._values_serializers[serializer_class]
+
+    def list(self, request, *args, **kwargs):
+        values_serializer = self.get_values_serializer()
+        queryset = values_serializer.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.serialize(page))
+        return Response(values_serializer.serialize(queryset))
@@ -1,15 +1,43 @@
 
-from rest_framework import generics, status
+from datetime import datetime, time, timedelta
+from rest_framework import generics, serializers, status
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import NotFound, ValidationError as DRFValidationError
+from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
-from .models import User, Project, Milestone, Task, Comment, Attachment, ProjectMember
+from django.urls import reverse
+from django_filters.rest_framework import DjangoFilterBackend
+from django.http import Http404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.conf import settings
+from django.db.models import Exists, F, OuterRef, Q, Window
+from django.db.models.functions import Lower, RowNumber
+from .models import (
+    MAX_PROJECTS_PER_USER, User, Project, Milestone, Task, Comment, Attachment, ProjectMember, ProjectStats, TimeEntry,
+    SearchEntry, Tombstone
+)
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserDetailSerializer, UserCreateSerializer,
     ProjectSerializer, MilestoneSerializer, TaskSerializer, CommentSerializer, AttachmentSerializer,
-    ProjectMemberSerializer, ProjectMemberListSerializer
+    ProjectMemberSerializer, ProjectMemberListSerializer, ProjectMemberBulkSerializer, ProjectStatsSerializer,
+    TimeEntrySerializer, LogTimeSerializer, TaskBulkSerializer, TaskStatusBulkSerializer, SearchResultSerializer
+)
+from .conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from .exports import ExportMixin
+from .filters import TaskFilter
+from .imports import IMPORT_FORMATS, IMPORTERS, read_records
+from .pagination import (
+    KeysetPagination, SearchPagination, UsernameKeysetPagination,
+    decode_cursor, decode_position, encode_cursor, encode_position,
 )
+from .search import search
+from .values import ValuesListMixin
+from .visibility import visible_project_ids
 from .permissions import (
     IsAdminUser, IsManagerOrAdmin, CanCreateUsers, CanCreateProjects, CanAssignUsers, CanAssignTasks,
     IsOwnerOrManagerOrAdmin, IsTaskAssigneeOrManagerOrAdmin, IsProjectOwnerOrManagerOrAdmin,
@@ -64,24 +92,19 @@ class UserCreateView(generics.CreateAPIView):
     permission_classes = [IsAuthenticated, CanCreateUsers]
 
 # Project Views
-class ProjectListCreateView(generics.ListCreateAPIView):
+class ProjectListCreateView(ConditionalListMixin, generics.ListCreateAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_admin or user.is_manager:
-            return Project.objects.all()
-        else:
-            # Users see projects they own or are members of
-            return Project.objects.filter(
-                Q(owner=user) | Q(projectmembership__user=user)
-            ).distinct()
+        queryset = Project.objects.visible_to(self.request.user, visible_project_ids(self.request))
+        return ProjectSerializer.setup_eager_loading(queryset)
 
     def perform_create(self, serializer):
         serializer.save(owner=self.request.user)
 
-class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProjectDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrManagerOrAdmin]
@@ -93,8 +116,14 @@ class ProjectMemberListView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         project_id = self.kwargs.get('project_id')
-        project = get_object_or_404(Project, id=project_id)
-        return ProjectMember.objects.filter(project=project)
+        project = get_object_or_404(Project.objects.only('id'), id=project_id)
+        # Users (and their maintained project counts) come from the same query
+        return ProjectMember.objects.filter(project=project).select_related('user')
+
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return ProjectMemberListSerializer
+        return ProjectMemberSerializer
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -116,79 +145,150 @@ class ProjectMemberDetailView(generics.DestroyAPIView):
         user_id = self.kwargs.get('user_id')
         return get_object_or_404(ProjectMember, project_id=project_id, user_id=user_id)
 
+class ProjectMemberBulkView(generics.GenericAPIView):
+    """Add (POST) or remove (DELETE) many project members at once: {"user_ids": [...]}"""
+    serializer_class = ProjectMemberBulkSerializer
+    permission_classes = [IsAuthenticated, CanManageProjectMembers]
+
+    def post(self, request, *args, **kwargs):
+        project = get_object_or_404(Project, id=self.kwargs.get('project_id'))
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created, errors = serializer.add_members(project)
+        return Response(
+            {
+                'added': ProjectMemberSerializer(created, many=True).data,
+                'errors': errors
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        )
+
+    def delete(self, request, *args, **kwargs):
+        project = get_object_or_404(Project, id=self.kwargs.get('project_id'))
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        removed, errors = serializer.remove_members(project)
+        return Response({
+            'removed': removed,
+            'errors': errors
+        })
+
 class AvailableUsersListView(generics.ListAPIView):
     serializer_class = UserDetailSerializer
     permission_classes = [IsAuthenticated, CanManageProjectMembers]
+    pagination_class = UsernameKeysetPagination
 
     def get_queryset(self):
-        """Get users who can be added to projects (only 'user' role and not at max limit)"""
+        """Get users who can be added to projects (only 'user' role and not at max limit), optionally by ?search= prefix"""
         project_id = self.kwargs.get('project_id')
-        project = get_object_or_404(Project, id=project_id)
-        
-        # Get users with 'user' role who are not already members of this project
-        existing_members = ProjectMember.objects.filter(project=project).values_list('user_id', flat=True)
-        
-        # Get users who are at max limit (2 projects)
-        users_at_max = ProjectMember.objects.values('user').annotate(
-            project_count=models.Count('project')
-        ).filter(project_count__gte=2).values_list('user_id', flat=True)
+        project = get_object_or_404(Project.objects.only('id', 'owner'), id=project_id)
+        queryset = self.available_users(project.id, project.owner_id)
         
+        search = self.request.query_params.get('search', '').strip().lower()
+        if search:
+            queryset = queryset.alias(
+                username_lower=Lower('username'),
+                email_lower=Lower('email')
+            ).filter(
+                Q(username_lower__startswith=search) | Q(email_lower__startswith=search)
+            )
+        return queryset
+
+    @staticmethod
+    def available_users(project_id, owner_id):
+        """Users with 'user' role below the project cap who are not already members of this project"""
         return User.objects.filter(
-            role='user'
-        ).exclude(
-            id__in=existing_members
+            role='user',
+            project_count__lt=MAX_PROJECTS_PER_USER
         ).exclude(
-            id__in=users_at_max
+            id=owner_id  # Exclude project owner
         ).exclude(
-            id=project.owner.id  # Exclude project owner
+            Exists(ProjectMember.objects.filter(project_id=project_id, user=OuterRef('pk')))
         )
 
 # Milestone Views
-class MilestoneListCreateView(generics.ListCreateAPIView):
+class MilestoneListCreateView(ConditionalListMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = MilestoneSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_admin or user.is_manager:
-            return Milestone.objects.all()
-        else:
-            # Users see milestones of projects they own or are members of
-            return Milestone.objects.filter(
-                Q(project__owner=user) | Q(project__projectmembership__user=user)
-            ).distinct()
+        return Milestone.objects.visible_to(self.request.user, visible_project_ids(self.request))
 
-class MilestoneDetailView(generics.RetrieveUpdateDestroyAPIView):
+class MilestoneDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Milestone.objects.all()
     serializer_class = MilestoneSerializer
     permission_classes = [IsAuthenticated, IsMilestoneProjectOwnerOrManagerOrAdmin]
 
 # Task Views
-class TaskListCreateView(generics.ListCreateAPIView):
+class TaskListCreateView(ConditionalListMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = TaskFilter
+    ordering_fields = ['id', 'title', 'status', 'priority']
+    ordering = '-id'
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_admin or user.is_manager:
-            return Task.objects.all()
-        else:
-            # Users see tasks assigned to them or from projects they own/are members of
-            return Task.objects.filter(
-                Q(assignee=user) | 
-                Q(milestone__project__owner=user) | 
-                Q(milestone__project__projectmembership__user=user)
-            ).distinct()
-
-class TaskDetailView(generics.RetrieveUpdateDestroyAPIView):
+        return Task.objects.visible_to(self.request.user, visible_project_ids(self.request))
+
+class TaskDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated, IsTaskAssigneeOrManagerOrAdmin]
 
-class UserTasksView(generics.ListAPIView):
+class TaskBulkView(generics.GenericAPIView):
+    """Create (POST) or partially update (PATCH) many tasks at once: {"tasks": [...]}"""
+    serializer_class = TaskBulkSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created, errors = serializer.create_tasks()
+        return Response(
+            {
+                'created': TaskSerializer(created, many=True).data,
+                'errors': errors
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+        )
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated, errors = serializer.update_tasks()
+        return Response(
+            {
+                'updated': TaskSerializer(updated, many=True).data,
+                'errors': errors
+            },
+            status=status.HTTP_200_OK if updated else status.HTTP_400_BAD_REQUEST
+        )
+
+class TaskStatusBulkView(generics.GenericAPIView):
+    """Move many tasks to one status: {"task_ids": [...], "status": "done"}"""
+    serializer_class = TaskStatusBulkSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated, errors = serializer.change_status()
+        return Response(
+            {
+                'updated': updated,
+                'errors': errors
+            },
+            status=status.HTTP_200_OK if updated else status.HTTP_400_BAD_REQUEST
+        )
+
+class UserTasksView(ConditionalListMixin, ValuesListMixin, generics.ListAPIView):
     """Get tasks assigned to the authenticated user (user role only)"""
     serializer_class = TaskSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -201,38 +301,169 @@ class UserTasksView(generics.ListAPIView):
         return Task.objects.filter(assignee=user)
 
 class LogTimeView(generics.CreateAPIView):
-    serializer_class = TaskSerializer
+    serializer_class = LogTimeSerializer
     permission_classes = [IsAuthenticated]
 
     def post(self, request, *args, **kwargs):
         task = get_object_or_404(Task, pk=self.kwargs['pk'])
-        hours = request.data.get('hours', 0)
-        
-        if hours <= 0:
-            return Response(
-                {'error': 'Hours must be greater than 0'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         
-        task.logged_hours += float(hours)
-        task.save()
+        try:
+            entry = task.log_time(request.user, serializer.validated_data['hours'])
+        except ValidationError as e:
+            raise DRFValidationError(e.message_dict)
         
         return Response({
             'task_id': task.id,
-            'logged_hours': task.logged_hours
+            'logged_hours': task.logged_hours,
+            'time_entry_id': entry.id
         })
 
+class TimeEntryListView(generics.ListAPIView):
+    """Timesheet: time entries filtered by ?user=, ?task=, ?start= and ?end= (dates or datetimes)"""
+    serializer_class = TimeEntrySerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        user = self.request.user
+        params = self.request.query_params
+        queryset = TimeEntry.objects.all()
+        if user.is_admin or user.is_manager:
+            if params.get('user'):
+                queryset = queryset.filter(user_id=self.parse_id('user'))
+        else:
+            # Users see their own timesheet only
+            queryset = queryset.filter(user=user)
+        if params.get('task'):
+            queryset = queryset.filter(task_id=self.parse_id('task'))
+        if params.get('start'):
+            queryset = queryset.filter(logged_at__gte=self.parse_moment('start'))
+        if params.get('end'):
+            queryset = queryset.filter(logged_at__lt=self.parse_moment('end', end_of_day=True))
+        return queryset
+
+    def parse_id(self, name):
+        try:
+            return int(self.request.query_params[name])
+        except ValueError:
+            raise DRFValidationError({name: 'Expected an integer id.'})
+
+    def parse_moment(self, name, end_of_day=False):
+        """Parse a date or datetime parameter; a bare end date includes that whole day"""
+        value = self.request.query_params[name]
+        try:
+            day = parse_date(value)
+            moment = None if day else parse_datetime(value)
+        except ValueError:
+            day = moment = None
+        if day is not None:
+            if end_of_day:
+                day += timedelta(days=1)
+            moment = datetime.combine(day, time.min)
+        elif moment is None:
+            raise DRFValidationError({name: 'Expected a date (YYYY-MM-DD) or an ISO 8601 datetime.'})
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+# Exports
+class TaskExportView(ExportMixin, generics.GenericAPIView):
+    """Stream visible tasks as NDJSON or CSV (?as=csv), with the task list filters"""
+    permission_classes = [IsAuthenticated]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = TaskFilter
+    export_name = 'tasks'
+    export_fields = {
+        'id': 'id',
+        'title': 'title',
+        'description': 'description',
+        'status': 'status',
+        'priority': 'priority',
+        'assignee': 'assignee_id',
+        'milestone': 'milestone_id',
+        'project': 'milestone__project_id',
+        'logged_hours': 'logged_hours',
+        'updated_at': 'updated_at',
+    }
+
+    def get_queryset(self):
+        return Task.objects.visible_to(self.request.user, visible_project_ids(self.request))
+
+class TimeEntryExportView(ExportMixin, TimeEntryListView):
+    """Stream the timesheet as NDJSON or CSV (?as=csv), with the time entry list filters"""
+    export_name = 'time-entries'
+    export_fields = {
+        'id': 'id',
+        'task': 'task_id',
+        'project': 'task__milestone__project_id',
+        'user': 'user_id',
+        'hours': 'hours',
+        'logged_at': 'logged_at',
+    }
+
+class CommentExportView(ExportMixin, generics.GenericAPIView):
+    """Stream visible comments as NDJSON or CSV (?as=csv), optionally for one ?task="""
+    permission_classes = [IsAuthenticated]
+    export_name = 'comments'
+    export_fields = {
+        'id': 'id',
+        'task': 'task_id',
+        'user': 'user_id',
+        'content': 'content',
+        'timestamp': 'timestamp',
+        'updated_at': 'updated_at',
+    }
+
+    def get_queryset(self):
+        queryset = Comment.objects.visible_to(self.request.user, visible_project_ids(self.request))
+        task_id = self.request.query_params.get('task')
+        if task_id:
+            try:
+                queryset = queryset.filter(task_id=int(task_id))
+            except ValueError:
+                raise DRFValidationError({'task': 'Expected an integer id.'})
+        return queryset
+
+# Imports
+class ImportView(generics.GenericAPIView):
+    """
+    Create projects, milestones or tasks from an uploaded CSV or NDJSON file
+    (multipart field `file`; ?as=csv|ndjson, guessed from the file name by
+    default). Valid rows are inserted and invalid ones reported by line.
+    """
+    permission_classes = [IsAuthenticated, IsManagerOrAdmin]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, kind, *args, **kwargs):
+        importer_class = IMPORTERS.get(kind)
+        if importer_class is None:
+            raise Http404
+        upload = request.FILES.get('file')
+        if upload is None:
+            raise DRFValidationError({'file': 'No file was submitted.'})
+        import_format = request.query_params.get('as') or ('csv' if upload.name.lower().endswith('.csv') else 'ndjson')
+        if import_format not in IMPORT_FORMATS:
+            raise DRFValidationError({'as': f"Unknown import format. Use {', '.join(IMPORT_FORMATS)}."})
+        result = importer_class(request.user).run(read_records(upload, import_format))
+        return Response(
+            result,
+            status=status.HTTP_201_CREATED if result['created'] else status.HTTP_400_BAD_REQUEST
+        )
+
 class ProjectHoursView(generics.RetrieveAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
-        total_hours = sum(task.logged_hours for task in project.milestones.all().values_list('tasks__logged_hours', flat=True))
+        stats = ProjectStats.get_for_project(self.kwargs['pk'])
+        if stats is None:
+            raise Http404
         
         return Response({
-            'project_id': project.id,
-            'total_hours': total_hours
+            'project_id': stats.project_id,
+            'total_hours': stats.total_hours
         })
 
 class ProjectProgressView(generics.RetrieveAPIView):
@@ -240,60 +471,371 @@ class ProjectProgressView(generics.RetrieveAPIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        project = get_object_or_404(Project, pk=self.kwargs['pk'])
-        tasks = Task.objects.filter(milestone__project=project)
-        
-        if not tasks:
-            progress = 0
-        else:
-            completed_tasks = tasks.filter(status='done').count()
-            progress = (completed_tasks / tasks.count()) * 100
+        stats = ProjectStats.get_for_project(self.kwargs['pk'])
+        if stats is None:
+            raise Http404
         
         return Response({
-            'project_id': project.id,
-            'progress_percent': round(progress, 2)
+            'project_id': stats.project_id,
+            'progress_percent': stats.progress_percent
+        })
+
+class ProjectBoardView(generics.GenericAPIView):
+    """
+    Kanban board of a project: tasks grouped by status, newest first, with a
+    count and an independent cursor per column (?cursor_<status>=...).
+    Served by the stats row and one windowed task query whatever the board size.
+    """
+    serializer_class = TaskSerializer
+    permission_classes = [IsAuthenticated, IsProjectMemberOrManagerOrAdmin]
+
+    def get_page_size(self):
+        try:
+            page_size = int(self.request.query_params.get('page_size', settings.API_PAGE_SIZE))
+        except ValueError:
+            page_size = settings.API_PAGE_SIZE
+        return max(1, min(page_size, settings.API_MAX_PAGE_SIZE))
+
+    def get_statuses(self):
+        """Columns to return: every status, or the ones listed in ?status=todo,done"""
+        statuses = [value for value, label in Task.STATUS_CHOICES]
+        requested = [value for value in self.request.query_params.get('status', '').split(',') if value]
+        if not requested:
+            return statuses
+        invalid = [value for value in requested if value not in statuses]
+        if invalid:
+            raise DRFValidationError({'status': f"Unknown status(es): {', '.join(invalid)}."})
+        return [value for value in statuses if value in requested]
+
+    def get(self, request, *args, **kwargs):
+        stats = ProjectStats.get_for_project(self.kwargs['pk'])
+        if stats is None:
+            raise Http404
+        self.check_object_permissions(request, stats)
+        statuses = self.get_statuses()
+        page_size = self.get_page_size()
+
+        # One row-numbered query over all columns, each continuing from its own cursor
+        columns = Q()
+        for value in statuses:
+            column = Q(status=value)
+            cursor = request.query_params.get(f'cursor_{value}')
+            if cursor:
+                column &= Q(id__lt=decode_position(cursor))
+            columns |= column
+        tasks = Task.objects.filter(columns, milestone__project=stats.project_id).annotate(
+            column_position=Window(RowNumber(), partition_by=[F('status')], order_by=F('id').desc())
+        ).filter(column_position__lte=page_size + 1).order_by('status', '-id')
+
+        grouped = {value: [] for value in statuses}
+        for task in tasks:
+            grouped[task.status].append(task)
+
+        labels = dict(Task.STATUS_CHOICES)
+        board = []
+        for value in statuses:
+            column_tasks = grouped[value][:page_size]
+            next_url = None
+            if len(grouped[value]) > page_size:
+                next_url = replace_query_param(
+                    request.build_absolute_uri(), f'cursor_{value}', encode_position(column_tasks[-1].id)
+                )
+            board.append({
+                'status': value,
+                'label': labels[value],
+                'count': getattr(stats, ProjectStats.STATUS_FIELDS[value]),
+                'next': next_url,
+                'results': self.get_serializer(column_tasks, many=True).data
+            })
+        return Response({
+            'project_id': stats.project_id,
+            'columns': board
         })
 
+class ProjectOverviewView(generics.GenericAPIView):
+    """
+    Everything the project screen needs in one response, from a fixed set of
+    queries: ?sections=project,stats,members,available_users,milestones,tasks
+    (default: every section the user may see). Members and available users
+    need member-management rights; tasks and available users return their
+    first page with a `next` link into the regular list endpoints.
+    """
+    permission_classes = [IsAuthenticated, IsProjectMemberOrManagerOrAdmin]
+    sections = ['project', 'stats', 'members', 'available_users', 'milestones', 'tasks']
+    member_management_sections = {'members', 'available_users'}
+
+    def get_sections(self):
+        allowed = [
+            section for section in self.sections
+            if section not in self.member_management_sections or self.request.user.can_manage_project_members()
+        ]
+        requested = [section for section in self.request.query_params.get('sections', '').split(',') if section]
+        if not requested:
+            return allowed
+        unknown = [section for section in requested if section not in self.sections]
+        if unknown:
+            raise DRFValidationError({'sections': f"Unknown section(s): {', '.join(unknown)}. Use {', '.join(self.sections)}."})
+        if any(section not in allowed for section in requested):
+            self.permission_denied(self.request, message='You do not have permission to manage project members.')
+        return [section for section in self.sections if section in requested]
+
+    def first_page(self, queryset, serializer_class, list_url, position_field):
+        """First page of a keyset-paginated list, with the `next` link its list endpoint would give"""
+        page_size = settings.API_PAGE_SIZE
+        rows = list(queryset[:page_size + 1])
+        next_url = None
+        if len(rows) > page_size:
+            rows = rows[:page_size]
+            next_url = replace_query_param(
+                self.request.build_absolute_uri(list_url), 'cursor', encode_position(getattr(rows[-1], position_field))
+            )
+        context = self.get_serializer_context()
+        return {'next': next_url, 'results': serializer_class(rows, many=True, context=context).data}
+
+    def get(self, request, *args, **kwargs):
+        stats = ProjectStats.get_for_project(self.kwargs['pk'])
+        if stats is None:
+            raise Http404
+        self.check_object_permissions(request, stats)
+        sections = self.get_sections()
+        project_id = stats.project_id
+        context = self.get_serializer_context()
+        data = {'project_id': project_id}
+
+        project = None
+        if 'project' in sections or 'members' in sections or 'available_users' in sections:
+            # Memberships come prefetched with their users for both project and members
+            project = ProjectSerializer.setup_eager_loading(Project.objects.filter(pk=project_id)).get()
+        if 'project' in sections:
+            data['project'] = ProjectSerializer(project, context=context).data
+        if 'stats' in sections:
+            data['stats'] = ProjectStatsSerializer(stats, context=context).data
+        if 'members' in sections:
+            data['members'] = ProjectMemberListSerializer(project.projectmembership.all(), many=True, context=context).data
+        if 'available_users' in sections:
+            data['available_users'] = self.first_page(
+                AvailableUsersListView.available_users(project_id, project.owner_id).order_by('username'),
+                UserDetailSerializer,
+                reverse('available-users', args=[project_id]),
+                'username'
+            )
+        if 'milestones' in sections:
+            milestones = Milestone.objects.filter(project_id=project_id).order_by('due_date', 'id')
+            data['milestones'] = MilestoneSerializer(milestones, many=True, context=context).data
+        if 'tasks' in sections:
+            tasks = self.first_page(
+                Task.objects.filter(milestone__project_id=project_id).order_by('-id'),
+                TaskSerializer,
+                f"{reverse('task-list-create')}?project={project_id}",
+                'id'
+            )
+            data['tasks'] = {'count': stats.task_count, **tasks}
+        return Response(data)
+
+class ProjectStatsBatchView(generics.ListAPIView):
+    """Progress and total hours for many projects: ?ids=1,2,3 or every project visible to the user"""
+    serializer_class = ProjectStatsSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    stats_fields = ['total_hours', 'milestone_count', *ProjectStats.STATUS_FIELDS.values()]
+
+    def get_queryset(self):
+        queryset = Project.objects.visible_to(self.request.user, visible_project_ids(self.request))
+        ids = self.request.query_params.get('ids')
+        if ids:
+            try:
+                queryset = queryset.filter(pk__in=[int(project_id) for project_id in ids.split(',') if project_id.strip()])
+            except ValueError:
+                raise DRFValidationError({'ids': 'Expected a comma-separated list of project ids.'})
+        # One query: the rollup rows are LEFT JOINed onto the visible projects
+        return queryset.values('id', *[f'stats__{field}' for field in self.stats_fields])
+
+    def list(self, request, *args, **kwargs):
+        rows = self.paginate_queryset(self.get_queryset())
+        stats = []
+        missing_ids = []
+        for row in rows:
+            if row['stats__total_hours'] is None:
+                missing_ids.append(row['id'])
+                continue
+            stats.append(ProjectStats(
+                project_id=row['id'],
+                **{field: row[f'stats__{field}'] for field in self.stats_fields}
+            ))
+        if missing_ids:
+            stats.extend(ProjectStats.rebuild(missing_ids).values())
+            stats.sort(key=lambda project_stats: project_stats.project_id, reverse=True)
+        serializer = self.get_serializer(stats, many=True)
+        return self.get_paginated_response(serializer.data)
+
 # Comment Views
-class CommentListCreateView(generics.ListCreateAPIView):
+class CommentListCreateView(ConditionalListMixin, ValuesListMixin, generics.ListCreateAPIView):
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_admin or user.is_manager:
-            return Comment.objects.all()
-        else:
-            # Users see comments from tasks they're assigned to or projects they own/are members of
-            return Comment.objects.filter(
-                Q(task__assignee=user) | 
-                Q(task__milestone__project__owner=user) | 
-                Q(task__milestone__project__projectmembership__user=user)
-            ).distinct()
-
-class CommentDetailView(generics.RetrieveUpdateDestroyAPIView):
+        return Comment.objects.visible_to(self.request.user, visible_project_ids(self.request))
+
+class CommentDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     permission_classes = [IsAuthenticated, IsOwnerOrManagerOrAdmin]
 
 # Attachment Views
-class AttachmentListCreateView(generics.ListCreateAPIView):
+class AttachmentListCreateView(ConditionalListMixin, generics.ListCreateAPIView):
     serializer_class = AttachmentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
 
     def get_queryset(self):
-        user = self.request.user
-        if user.is_admin or user.is_manager:
-            return Attachment.objects.all()
-        else:
-            # Users see attachments from tasks they're assigned to or projects they own/are members of
-            return Attachment.objects.filter(
-                Q(task__assignee=user) | 
-                Q(task__milestone__project__owner=user) | 
-                Q(task__milestone__project__projectmembership__user=user)
-            ).distinct()
-
-class AttachmentDetailView(generics.RetrieveUpdateDestroyAPIView):
+        return Attachment.objects.visible_to(self.request.user, visible_project_ids(self.request))
+
+class AttachmentDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Attachment.objects.all()
     serializer_class = AttachmentSerializer
     permission_classes = [IsAuthenticated, IsProjectMemberOrManagerOrAdmin]
+
+# Search
+class SearchView(generics.ListAPIView):
+    """Ranked full-text search over tasks, comments and projects: ?q=<words>&type=task,comment"""
+    serializer_class = SearchResultSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchPagination
+
+    def get_queryset(self):
+        query = self.request.query_params.get('q', '').strip()
+        if not query:
+            raise DRFValidationError({'q': 'This query parameter is required.'})
+        queryset = SearchEntry.objects.visible_to(self.request.user, visible_project_ids(self.request))
+        types = self.request.query_params.get('type')
+        if types:
+            kinds = [kind for kind in types.split(',') if kind]
+            valid_kinds = dict(SearchEntry.KIND_CHOICES)
+            invalid = [kind for kind in kinds if kind not in valid_kinds]
+            if invalid:
+                raise DRFValidationError({'type': f"Unknown type(s): {', '.join(invalid)}. Use {', '.join(valid_kinds)}."})
+            queryset = queryset.filter(kind__in=kinds)
+        return search(queryset, query).order_by('-rank', 'id')
+
+# Delta sync
+class SyncView(generics.GenericAPIView):
+    """
+    Rows created, changed or deleted after ?since=<watermark>, for clients
+    that keep a local copy. Without `since` every visible row is returned.
+    At most SYNC_PAGE_SIZE rows come back per response, deletes first and
+    then table by table in id order; follow `next` until it is null, then
+    pass the returned `watermark` as `since` on the next sync.
+    """
+    permission_classes = [IsAuthenticated]
+    synced_models = [
+        ('projects', Project, ProjectSerializer),
+        ('milestones', Milestone, MilestoneSerializer),
+        ('tasks', Task, TaskSerializer),
+        ('comments', Comment, CommentSerializer),
+        ('attachments', Attachment, AttachmentSerializer),
+    ]
+
+    def get_since(self):
+        value = self.request.query_params.get('since')
+        if not value:
+            return None
+        try:
+            since = parse_datetime(value)
+        except ValueError:
+            since = None
+        if since is None:
+            raise DRFValidationError({'since': 'Expected an ISO 8601 datetime, such as a previous watermark.'})
+        if timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def get_cursor(self, keys, watermark):
+        """(watermark, section key, last id) to resume from; every page keeps the first page's watermark"""
+        value = self.request.query_params.get('cursor')
+        if not value:
+            return watermark, keys[0], 0
+        fields = decode_cursor(value)
+        try:
+            watermark = parse_datetime(fields['w'])
+            if watermark is None or fields['s'] not in keys:
+                raise ValueError
+            return watermark, fields['s'], int(fields['p'])
+        except (KeyError, ValueError):
+            raise NotFound(CursorPagination.invalid_cursor_message)
+
+    def get_sections(self, since):
+        """(key, queryset, serializer class) for each part of the response, in paging order"""
+        user = self.request.user
+        project_ids = visible_project_ids(self.request)
+        sections = []
+        if since is not None:
+            tombstones = Tombstone.objects.visible_to(user, project_ids).filter(deleted_at__gt=since)
+            sections.append(('deleted', tombstones, None))
+        resent_ids = []
+        if since is not None and project_ids is not None:
+            # Rows of projects the user joined since the watermark are new to them however old they are, and
+            # after a removal the client drops the project's rows, so the ones still visible are sent again
+            resent_ids = list(
+                ProjectMember.objects.filter(user=user, joined_at__gt=since).values_list('project_id', flat=True)
+            ) + list(
+                Tombstone.objects.filter(kind='membership', assignee_id=user.pk, deleted_at__gt=since)
+                .values_list('project_id', flat=True)
+            )
+        for key, model, serializer_class in self.synced_models:
+            queryset = model.objects.visible_to(user, project_ids)
+            if since is not None:
+                changed = Q(updated_at__gt=since)
+                if resent_ids:
+                    changed |= Q(**{f'{queryset.project_lookup or "pk"}__in': resent_ids})
+                queryset = queryset.filter(changed)
+            if serializer_class is ProjectSerializer:
+                queryset = ProjectSerializer.setup_eager_loading(queryset)
+            sections.append((key, queryset, serializer_class))
+        return sections
+
+    def get(self, request, *args, **kwargs):
+        now = timezone.now()
+        # updated_at is set before the write commits, so a transaction still open now can commit rows
+        # stamped earlier than now; the lag lets the next sync pick them up (at the cost of a few repeats)
+        watermark = now - timedelta(seconds=settings.SYNC_WATERMARK_LAG_SECONDS)
+        since = self.get_since()
+        if since is not None and since < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            return Response(
+                {'error': 'since is older than the deletion history; sync again without since.'},
+                status=status.HTTP_410_GONE
+            )
+        sections = self.get_sections(since)
+        keys = [key for key, _, _ in sections]
+        watermark, section, position = self.get_cursor(keys, watermark)
+        start = keys.index(section)
+
+        data = {
+            'watermark': serializers.DateTimeField().to_representation(watermark),
+            'full': since is None,
+            'next': None,
+            'deleted': [],
+        }
+        context = self.get_serializer_context()
+        rows_left = settings.SYNC_PAGE_SIZE
+        for index, (key, queryset, serializer_class) in enumerate(sections):
+            data[key] = []
+            if index < start or data['next']:
+                continue
+            if index == start:
+                queryset = queryset.filter(id__gt=position)
+            else:
+                position = 0
+            rows = list(queryset.order_by('id')[:rows_left + 1])
+            if len(rows) > rows_left:
+                rows = rows[:rows_left]
+                data['next'] = replace_query_param(
+                    request.build_absolute_uri(), 'cursor',
+                    encode_cursor(w=data['watermark'], s=key, p=rows[-1].id if rows else position)
+                )
+            rows_left -= len(rows)
+            if serializer_class is None:
+                data[key] = [{'type': row.kind, 'id': row.object_id} for row in rows]
+            elif rows:
+                data[key] = serializer_class(rows, many=True, context=context).data
+        return Response(data)
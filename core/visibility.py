@@ -0,0 +1,62 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+
+class ProjectVisibility:
+    """Ids of the projects a user owns or is a member of"""
+
+    def __init__(self, owned_ids, member_ids):
+        self.owned_ids = frozenset(owned_ids)
+        self.member_ids = frozenset(member_ids)
+        self.visible_ids = self.owned_ids | self.member_ids
+
+
+def _cache_key(user_id):
+    return f'project-visibility:{user_id}'
+
+
+def get_project_visibility(user, request=None):
+    """
+    Return the user's ProjectVisibility, memoized on the request and kept in
+    the shared cache for PROJECT_VISIBILITY_CACHE_TTL seconds (0 turns the
+    cache off, the default without a shared cache backend). Entries are
+    dropped by the signal handlers in core.signals when ownership or
+    membership changes.
+    """
+    if request is not None and getattr(request, '_project_visibility', None) is not None:
+        return request._project_visibility
+
+    ttl = settings.PROJECT_VISIBILITY_CACHE_TTL
+    cached = cache.get(_cache_key(user.pk)) if ttl > 0 else None
+    if cached is None:
+        from .models import Project, ProjectMember
+        cached = (
+            list(Project.objects.filter(owner_id=user.pk).values_list('pk', flat=True)),
+            list(ProjectMember.objects.filter(user_id=user.pk).values_list('project_id', flat=True)),
+        )
+        if ttl > 0:
+            cache.set(_cache_key(user.pk), cached, ttl)
+    visibility = ProjectVisibility(*cached)
+
+    if request is not None:
+        request._project_visibility = visibility
+    return visibility
+
+
+def visible_project_ids(request):
+    """Project ids the requesting user may see, or None when they can see every project"""
+    user = request.user
+    if user.is_admin or user.is_manager:
+        return None
+    return get_project_visibility(user, request).visible_ids
+
+
+def invalidate_project_visibility(*user_ids):
+    """Drop cached visibility now and again once the surrounding transaction commits"""
+    keys = [_cache_key(user_id) for user_id in set(user_ids) if user_id is not None]
+    if not keys:
+        return
+    cache.delete_many(keys)
+    # A concurrent request may re-cache the old sets before this transaction commits
+    transaction.on_commit(lambda: cache.delete_many(keys))
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from importlib.util import find_spec
+from django.core.exceptions import ImproperlyConfigured
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -39,10 +41,16 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
     "core",
     "rest_framework",
+    "django_filters",
     "corsheaders",
 ]
 
-MIDDLEWARE = [
+# API profile: "full" runs the browser middleware and session/basic auth on
+# every request; "lean" skips them under API_PATH_PREFIX and uses JWT only
+API_PROFILE = os.environ.get('API_PROFILE', 'full')
+API_PATH_PREFIX = '/api/'
+
+FULL_MIDDLEWARE = [
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -54,6 +62,30 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Only needed by the admin and other browser-facing pages
+BROWSER_ONLY_MIDDLEWARE = [
+    "django.contrib.sessions.middleware.SessionMiddleware",
+    "django.middleware.csrf.CsrfViewMiddleware",
+    "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "django.contrib.messages.middleware.MessageMiddleware",
+    "django.middleware.clickjacking.XFrameOptionsMiddleware",
+]
+
+LEAN_MIDDLEWARE = [
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "django.middleware.security.SecurityMiddleware",
+    "corsheaders.middleware.CorsMiddleware",
+    "django.middleware.common.CommonMiddleware",
+    "core.middleware.BrowserOnlyMiddleware",
+]
+
+# The admin checks for session, auth and message middleware only look at MIDDLEWARE;
+# in the lean profile BrowserOnlyMiddleware still runs them for non-API paths
+LEAN_SILENCED_SYSTEM_CHECKS = ['admin.E408', 'admin.E409', 'admin.E410']
+
+MIDDLEWARE = LEAN_MIDDLEWARE if API_PROFILE == 'lean' else FULL_MIDDLEWARE
+SILENCED_SYSTEM_CHECKS = LEAN_SILENCED_SYSTEM_CHECKS if API_PROFILE == 'lean' else []
+
 ROOT_URLCONF = "project_dashboard.urls"
 
 TEMPLATES = [
@@ -132,6 +164,85 @@ REST_FRAMEWORK = {
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ]
 }
+if API_PROFILE == 'lean':
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] = [
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ]
+
+# Encode and decode JSON with orjson (stdlib json when it isn't installed)
+FAST_JSON_ENABLED = os.environ.get('FAST_JSON_ENABLED', 'True') == 'True'
+REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+    'core.renderers.FastJSONRenderer' if FAST_JSON_ENABLED else 'rest_framework.renderers.JSONRenderer',
+    'rest_framework.renderers.BrowsableAPIRenderer',
+]
+REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+    'core.parsers.FastJSONParser' if FAST_JSON_ENABLED else 'rest_framework.parsers.JSONParser',
+    'rest_framework.parsers.FormParser',
+    'rest_framework.parsers.MultiPartParser',
+]
+# Offer application/msgpack (Accept and Content-Type) to internal clients when msgpack is installed
+if find_spec('msgpack') is not None:
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'].append('core.renderers.MessagePackRenderer')
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'].append('core.parsers.MessagePackParser')
+
+# Cache (local memory by default; point CACHE_BACKEND/CACHE_LOCATION at a shared cache such as Redis in production)
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache")
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKEND,
+        "LOCATION": os.environ.get("CACHE_LOCATION", ""),
+    }
+}
+# LocMemCache is private to each process, so with several gunicorn workers an
+# invalidation only reaches the worker that made the change. Cross-request
+# caches of permission data (project visibility, JWT users) need a cache
+# every worker shares.
+SHARED_CACHE = CACHE_BACKEND not in (
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+)
+
+# Seconds a user's owned/member project ids stay cached (see core.visibility);
+# off by default without a shared cache
+PROJECT_VISIBILITY_CACHE_TTL = int(os.environ.get("PROJECT_VISIBILITY_CACHE_TTL", "300" if SHARED_CACHE else "0"))
+
+# Resolve JWT users from a cache instead of a users-table lookup per request
+JWT_USER_CACHE_ENABLED = os.environ.get('JWT_USER_CACHE_ENABLED', 'False') == 'True'
+JWT_USER_CACHE_TTL = int(os.environ.get('JWT_USER_CACHE_TTL', '300'))
+JWT_USER_LOCAL_CACHE_TTL = int(os.environ.get('JWT_USER_LOCAL_CACHE_TTL', '5'))
+JWT_USER_LOCAL_CACHE_SIZE = int(os.environ.get('JWT_USER_LOCAL_CACHE_SIZE', '10000'))
+if JWT_USER_CACHE_ENABLED and not SHARED_CACHE:
+    raise ImproperlyConfigured(
+        "JWT_USER_CACHE_ENABLED needs a cache shared by all workers; set CACHE_BACKEND to e.g. Redis"
+    )
+if JWT_USER_CACHE_ENABLED:
+    REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES'] = [
+        'core.authentication.CachedJWTAuthentication' if path == 'rest_framework_simplejwt.authentication.JWTAuthentication' else path
+        for path in REST_FRAMEWORK['DEFAULT_AUTHENTICATION_CLASSES']
+    ]
+
+# Keyset pagination for list endpoints: default page size and the upper
+# bound accepted through the ?page_size= query parameter
+API_PAGE_SIZE = int(os.environ.get('API_PAGE_SIZE', '50'))
+API_MAX_PAGE_SIZE = int(os.environ.get('API_MAX_PAGE_SIZE', '500'))
+
+# Upper bound on the number of tasks accepted by one bulk task request
+TASK_BULK_MAX_ITEMS = int(os.environ.get('TASK_BULK_MAX_ITEMS', '500'))
+
+# Rows fetched per round trip by the streaming exports under /api/exports/
+EXPORT_CHUNK_SIZE = int(os.environ.get('EXPORT_CHUNK_SIZE', '2000'))
+
+# Rows validated and inserted together by the CSV/NDJSON imports
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', '500'))
+
+# Delete tombstones for /api/sync/ are kept this long; older watermarks need a full sync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
+
+# How far the /api/sync/ watermark trails the clock; must exceed the longest write transaction
+SYNC_WATERMARK_LAG_SECONDS = int(os.environ.get('SYNC_WATERMARK_LAG_SECONDS', '30'))
+
+# Rows (deletes included) returned per /api/sync/ response; the rest follow through `next`
+SYNC_PAGE_SIZE = int(os.environ.get('SYNC_PAGE_SIZE', '1000'))
 
 # JWT Settings
 from datetime import timedelta
@@ -171,3 +282,4 @@ CORS_ALLOW_CREDENTIALS = True
 
 # Custom user model
 AUTH_USER_MODEL = "core.User"
+